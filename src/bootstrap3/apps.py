@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+from .bootstrap import load_renderers
+
+
+class Bootstrap3Config(AppConfig):
+    name = "bootstrap3"
+    verbose_name = "Bootstrap3"
+
+    def ready(self):
+        # Fail at startup instead of on the first request that uses a misconfigured renderer
+        load_renderers()
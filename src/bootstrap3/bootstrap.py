@@ -1,6 +1,13 @@
+import json
+import warnings
 from importlib import import_module
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
+
+from .exceptions import BootstrapError
 
 # Default settings
 BOOTSTRAP3_DEFAULTS = {
@@ -17,6 +24,7 @@ BOOTSTRAP3_DEFAULTS = {
     },
     "jquery_url": "//code.jquery.com/jquery.min.js",
     "javascript_in_head": False,
+    "javascript_loading": None,
     "include_jquery": False,
     "horizontal_label_class": "col-md-3",
     "horizontal_field_class": "col-md-9",
@@ -24,6 +32,12 @@ BOOTSTRAP3_DEFAULTS = {
     "required_css_class": "",
     "error_css_class": "has-error",
     "success_css_class": "has-success",
+    "form_cache": False,
+    "form_cache_alias": None,
+    "form_cache_size": 128,
+    "holes": {},
+    "asset_manifest": None,
+    "critical_css": None,
     "formset_renderers": {"default": "bootstrap3.renderers.FormsetRenderer"},
     "form_renderers": {"default": "bootstrap3.renderers.FormRenderer"},
     "field_renderers": {
@@ -33,38 +47,133 @@ BOOTSTRAP3_DEFAULTS = {
 }
 
 
+class BootstrapSettings:
+    """Read-only snapshot of the resolved BOOTSTRAP3 settings."""
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Bootstrap settings are read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Bootstrap settings are read-only.")
+
+    def get(self, name, default=None):
+        """Return a setting, or `default` if it does not exist."""
+        return self.__dict__.get(name, default)
+
+
+_bootstrap_settings = None
+
+# Assets in the asset manifest, keyed by URL setting
+_asset_manifest = None
+
+# Renderer classes, keyed by (setting name, layout)
+_renderer_classes = {}
+
+RENDERER_SETTINGS = ("formset_renderers", "form_renderers", "field_renderers")
+
+
+def get_bootstrap_settings():
+    """
+    Return the resolved settings.
+
+    The settings are resolved once and cached for the lifetime of the process. The cache is
+    reset when Django sends `setting_changed`, so `override_settings` keeps working in tests.
+    """
+    global _bootstrap_settings
+    bootstrap_settings = _bootstrap_settings
+    if bootstrap_settings is None:
+        # Start with a copy of default settings
+        bootstrap3 = BOOTSTRAP3_DEFAULTS.copy()
+
+        # Override with user settings from settings.py
+        bootstrap3.update(getattr(settings, "BOOTSTRAP3", {}))
+
+        # Update use_i18n
+        bootstrap3["use_i18n"] = i18n_enabled()
+
+        bootstrap_settings = _bootstrap_settings = BootstrapSettings(bootstrap3)
+    return bootstrap_settings
+
+
+def get_asset_manifest():
+    """
+    Return the assets in the manifest written by the ``bootstrap3_vendor`` command, keyed by URL setting.
+
+    The manifest set in ``asset_manifest`` is read once. Without a manifest, or if it cannot be read, there are no
+    assets and the URL settings are used.
+    """
+    global _asset_manifest
+    asset_manifest = _asset_manifest
+    if asset_manifest is None:
+        asset_manifest = {}
+        path = get_bootstrap_setting("asset_manifest")
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    asset_manifest = json.load(f)["assets"]
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                warnings.warn(f'Cannot read asset manifest "{path}", using the URL settings: {e!r}', RuntimeWarning)
+        _asset_manifest = asset_manifest
+    return asset_manifest
+
+
+def get_asset_url(name):
+    """
+    Return the URL setting `name`, or the static URL of its file in the asset manifest.
+
+    Paths in the manifest are relative to the static files. They are turned into static URLs when the URL is
+    asked for, so the storage is not used while the settings are read.
+    """
+    asset = get_asset_manifest().get(name, None)
+    if asset:
+        try:
+            url = {"url": static(asset["path"]), "integrity": asset["integrity"]}
+        except (ValueError, KeyError, TypeError) as e:
+            # E.g. ManifestStaticFilesStorage has no entry for the file before collectstatic
+            warnings.warn(f'Cannot use "{name}" from the asset manifest, using the setting: {e!r}', RuntimeWarning)
+        else:
+            if asset.get("crossorigin"):
+                url["crossorigin"] = asset["crossorigin"]
+            return url
+    return get_bootstrap_setting(name)
+
+
 def get_bootstrap_setting(name, default=None):
     """Read a setting."""
-    # Start with a copy of default settings
-    bootstrap3 = BOOTSTRAP3_DEFAULTS.copy()
-
-    # Override with user settings from settings.py
-    bootstrap3.update(getattr(settings, "BOOTSTRAP3", {}))
+    return get_bootstrap_settings().get(name, default)
 
-    # Update use_i18n
-    bootstrap3["use_i18n"] = i18n_enabled()
 
-    return bootstrap3.get(name, default)
+@receiver(setting_changed)
+def reset_bootstrap_settings(*, setting, **kwargs):
+    """Discard the resolved settings and renderer classes when a setting they depend on changes."""
+    global _bootstrap_settings, _asset_manifest
+    if setting in ("BOOTSTRAP3", "USE_I18N"):
+        _bootstrap_settings = None
+        _asset_manifest = None
+        _renderer_classes.clear()
 
 
 def jquery_url():
     """Return the full url to jQuery file to use."""
-    return get_bootstrap_setting("jquery_url")
+    return get_asset_url("jquery_url")
 
 
 def javascript_url():
     """Return the full url to the Bootstrap JavaScript file."""
-    return get_bootstrap_setting("javascript_url")
+    return get_asset_url("javascript_url")
 
 
 def css_url():
     """Return the full url to the Bootstrap CSS file."""
-    return get_bootstrap_setting("css_url")
+    return get_asset_url("css_url")
 
 
 def theme_url():
     """Return the full url to the theme CSS file."""
-    return get_bootstrap_setting("theme_url")
+    return get_asset_url("theme_url")
 
 
 def i18n_enabled():
@@ -79,16 +188,36 @@ def get_renderer(renderers, **kwargs):
     return getattr(import_module(mod), cls)
 
 
+def get_renderer_class(name, **kwargs):
+    """Return the renderer class for a renderer setting and layout, importing it on first use."""
+    renderers = get_bootstrap_setting(name)
+    layout = kwargs.get("layout", "")
+    if layout not in renderers:
+        layout = "default"
+    try:
+        return _renderer_classes[(name, layout)]
+    except KeyError:
+        renderer_cls = _renderer_classes[(name, layout)] = get_renderer(renderers, layout=layout)
+        return renderer_cls
+
+
+def load_renderers():
+    """Import all configured renderer classes, raise BootstrapError for a renderer that cannot be imported."""
+    for name in RENDERER_SETTINGS:
+        for layout, path in get_bootstrap_setting(name).items():
+            try:
+                get_renderer_class(name, layout=layout)
+            except (ImportError, AttributeError, ValueError) as e:
+                raise BootstrapError(f'Cannot import renderer "{path}" for layout "{layout}" in "{name}".') from e
+
+
 def get_formset_renderer(**kwargs):
-    renderers = get_bootstrap_setting("formset_renderers")
-    return get_renderer(renderers, **kwargs)
+    return get_renderer_class("formset_renderers", **kwargs)
 
 
 def get_form_renderer(**kwargs):
-    renderers = get_bootstrap_setting("form_renderers")
-    return get_renderer(renderers, **kwargs)
+    return get_renderer_class("form_renderers", **kwargs)
 
 
 def get_field_renderer(**kwargs):
-    renderers = get_bootstrap_setting("field_renderers")
-    return get_renderer(renderers, **kwargs)
+    return get_renderer_class("field_renderers", **kwargs)
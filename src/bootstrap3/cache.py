@@ -0,0 +1,214 @@
+import datetime
+import decimal
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.autoreload import file_changed
+from django.utils.functional import Promise
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from .bootstrap import get_bootstrap_settings
+
+# Values that have a stable repr, and can safely be part of a cache key
+CACHE_KEY_TYPES = (
+    str,
+    int,
+    float,
+    decimal.Decimal,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    type(None),
+)
+
+CACHE_KEY_PREFIX = "bootstrap3.form"
+
+
+class LRUCache:
+    """Bounded in-process cache that discards the least recently used entries first."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class UncacheableValue(Exception):
+    """Raised when a value cannot be part of a cache key."""
+
+
+def get_key_value(value):
+    """Return a representation of `value` that is equal for equal values in every process."""
+    if isinstance(value, Promise):
+        return str(value)
+    if isinstance(value, CACHE_KEY_TYPES):
+        return value
+    if isinstance(value, type) or (callable(value) and hasattr(value, "__qualname__")):
+        # Classes and functions by their dotted path
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, (list, tuple)):
+        return tuple(get_key_value(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), get_key_value(item)) for key, item in value.items()))
+    raise UncacheableValue(value)
+
+
+_form_cache = None
+_settings_digest = None
+
+
+def get_form_cache():
+    """Return the cache for rendered forms, either a configured Django cache or an in-process LRU cache."""
+    global _form_cache
+    bootstrap_settings = get_bootstrap_settings()
+    alias = bootstrap_settings.form_cache_alias
+    if alias:
+        return caches[alias]
+    form_cache = _form_cache
+    if form_cache is None:
+        form_cache = _form_cache = LRUCache(bootstrap_settings.form_cache_size)
+    return form_cache
+
+
+def get_settings_digest():
+    """Return a digest of the resolved settings, to invalidate cached forms when the settings change."""
+    global _settings_digest
+    settings_digest = _settings_digest
+    if settings_digest is None:
+        settings_value = []
+        for name, value in sorted(vars(get_bootstrap_settings()).items()):
+            try:
+                settings_value.append((name, get_key_value(value)))
+            except UncacheableValue:
+                # E.g. a partial as hole resolver, its repr differs per process but not between renders
+                settings_value.append((name, repr(value)))
+        settings_digest = _settings_digest = hashlib.sha256(repr(settings_value).encode()).hexdigest()
+    return settings_digest
+
+
+def get_form_cache_key(renderer_cls, form, **kwargs):
+    """
+    Return the cache key for rendering `form` with `renderer_cls` and `kwargs`, or None if it cannot be cached.
+
+    Only unbound forms without instance-level initial data can be cached, since their output does not depend
+    on the request. Initial values that are set on the fields of a form instance count as instance-level
+    initial data, since they are often per user. Fields are part of the key, so forms that change their fields
+    per request get separate entries. Forms with callable initial values, choices that are read from the
+    database or holes are never cached.
+    """
+    if form.is_bound or form.initial or kwargs.get("holes"):
+        # Hole markers are signed for the page they are rendered for, caching them would only fill the cache
+        return None
+    base_fields = type(form).base_fields
+    try:
+        parts = [
+            get_key_value(renderer_cls),
+            get_key_value(type(form)),
+            get_language(),
+            get_settings_digest(),
+            get_key_value(
+                [
+                    form.prefix,
+                    form.auto_id,
+                    form.label_suffix,
+                    form.use_required_attribute,
+                    getattr(form, "error_css_class", None),
+                    getattr(form, "required_css_class", None),
+                ]
+            ),
+            get_key_value(kwargs),
+        ]
+        for name, field in form.fields.items():
+            widget = field.widget
+            choices = getattr(widget, "choices", ())
+            if (
+                callable(field.initial)
+                or field.initial != getattr(base_fields.get(name), "initial", None)
+                or not isinstance(choices, (list, tuple))
+            ):
+                return None
+            parts.append(
+                get_key_value(
+                    [
+                        name,
+                        type(field),
+                        field.label,
+                        field.help_text,
+                        field.required,
+                        field.disabled,
+                        field.initial,
+                        field.show_hidden_initial,
+                        field.localize,
+                        type(widget),
+                        widget.attrs,
+                        choices,
+                    ]
+                )
+            )
+    except UncacheableValue:
+        return None
+    return f"{CACHE_KEY_PREFIX}:{hashlib.sha256(repr(parts).encode()).hexdigest()}"
+
+
+def render_cached_form(renderer_cls, form, **kwargs):
+    """Render a form with `renderer_cls`, reusing the HTML of an earlier render of the same form if possible."""
+    key = get_form_cache_key(renderer_cls, form, **kwargs)
+    if key is None:
+        return renderer_cls(form, **kwargs).render()
+    form_cache = get_form_cache()
+    html = form_cache.get(key)
+    if html is None:
+        html = str(renderer_cls(form, **kwargs).render())
+        form_cache.set(key, html)
+    return mark_safe(html)
+
+
+def clear_form_cache():
+    """Discard all forms in the in-process cache."""
+    global _settings_digest
+    _settings_digest = None
+    if _form_cache is not None:
+        _form_cache.clear()
+
+
+@receiver(setting_changed)
+def reset_form_cache(*, setting, **kwargs):
+    """Discard the in-process cache when a setting that changes rendered forms changes."""
+    global _form_cache
+    if setting in ("BOOTSTRAP3", "USE_I18N", "TEMPLATES", "INSTALLED_APPS", "STATIC_URL", "STORAGES"):
+        clear_form_cache()
+        _form_cache = None
+
+
+@receiver(file_changed)
+def reset_form_cache_on_file_changed(*, file_path, **kwargs):
+    """Discard the in-process cache when the development server sees a template change."""
+    if file_path.suffix != ".py":
+        clear_form_cache()
@@ -1,9 +1,22 @@
+import json
+import warnings
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.safestring import mark_safe
 
-from bootstrap3.utils import add_css_class, render_tag
+from bootstrap3.utils import add_css_class, render_link_tag, render_script_tag, render_tag, url_to_attrs_dict
 
+from .bootstrap import css_url, get_bootstrap_setting, javascript_url, jquery_url, theme_url
+from .exceptions import BootstrapError
 from .text import text_value
 
+# Values of the javascript_loading setting, None loads the scripts the classic, blocking way
+JAVASCRIPT_LOADING = (None, "defer", "module")
+
+# Rendered asset tags, keyed by asset and options. They only depend on the settings.
+_asset_tags = {}
+
 
 def render_icon(icon, **kwargs):
     """Render a Bootstrap glyphicon icon."""
@@ -29,3 +42,159 @@ def render_alert(content, alert_type=None, dismissable=True):
             "div", attrs={"class": " ".join(css_classes)}, content=mark_safe(button_placeholder) + text_value(content)
         ).replace(button_placeholder, button)
     )
+
+
+def render_css():
+    """Render the link tags for the Bootstrap CSS and the theme CSS."""
+    try:
+        return _asset_tags["css"]
+    except KeyError:
+        pass
+    rendered_urls = [render_link_tag(css_url())]
+    if theme_url():
+        rendered_urls.append(render_link_tag(theme_url()))
+    html = _asset_tags["css"] = mark_safe("".join(rendered_urls))
+    return html
+
+
+def render_async_css():
+    """Render preload link tags that turn into the Bootstrap CSS and theme CSS when they have loaded."""
+    try:
+        return _asset_tags["async_css"]
+    except KeyError:
+        pass
+    rendered_urls = []
+    for url in (css_url(), theme_url()):
+        if url:
+            attrs = url_to_attrs_dict(url, url_attr="href")
+            attrs.update({"rel": "preload", "as": "style", "onload": "this.onload=null;this.rel='stylesheet'"})
+            rendered_urls.append(render_tag("link", attrs=attrs, close=False))
+    html = _asset_tags["async_css"] = mark_safe("".join(rendered_urls))
+    return html
+
+
+def load_critical_css(path):
+    """Return the critical CSS per template name from a file written by the ``bootstrap3_critical_css`` command."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["templates"]
+    except (OSError, ValueError, KeyError) as e:
+        raise BootstrapError(f'Cannot read critical CSS "{path}": {e}') from e
+
+
+def get_critical_css(template_name):
+    """
+    Return the critical CSS for a template, or None if there is none.
+
+    The file set in ``critical_css`` is read once. If it cannot be read, no template has critical CSS.
+    """
+    try:
+        critical_css = _asset_tags["critical_css"]
+    except KeyError:
+        critical_css = {}
+        path = get_bootstrap_setting("critical_css")
+        if path:
+            try:
+                critical_css = load_critical_css(path)
+            except BootstrapError as e:
+                warnings.warn(f"{e}, using the normal link tags.", RuntimeWarning)
+        _asset_tags["critical_css"] = critical_css
+    return critical_css.get(template_name)
+
+
+# Context variable that makes bootstrap_critical_css render the normal link tags, e.g. while the critical CSS
+# is extracted from the page
+WITHOUT_CRITICAL_CSS = "bootstrap3_without_critical_css"
+
+
+def render_critical_css(template_name):
+    """
+    Render the critical CSS of a template inline, and load the full Bootstrap CSS without blocking rendering.
+
+    Browsers without JavaScript get the normal link tags in a noscript element. Templates without critical
+    CSS get the normal link tags of `render_css()`.
+    """
+    css = get_critical_css(template_name)
+    if css is None:
+        return render_css()
+    # Keep the stylesheet from closing the style element
+    style = render_tag("style", content=mark_safe(css.replace("</", "<\\/")))
+    return mark_safe(f"{style}{render_async_css()}<noscript>{render_css()}</noscript>")
+
+
+def get_javascript_loading(loading=None):
+    """Return how to load the JavaScript, `loading` or else the ``javascript_loading`` setting."""
+    if loading is None:
+        loading = get_bootstrap_setting("javascript_loading")
+    loading = loading or None
+    if loading not in JAVASCRIPT_LOADING:
+        raise BootstrapError(f'Invalid value "{loading}" for javascript_loading, use one of: "defer", "module".')
+    return loading
+
+
+def render_javascript(jquery=None, loading=None):
+    """
+    Render the script tags for Bootstrap JavaScript, and for jQuery if `jquery` is true.
+
+    With `loading` "defer" the scripts get the defer attribute, with "module" they are loaded as module scripts.
+    Both do not block parsing, and run in order after the document has been parsed, so after inline scripts.
+    """
+    # See if we have to include jQuery
+    if jquery is None:
+        jquery = get_bootstrap_setting("include_jquery", False)
+    loading = get_javascript_loading(loading)
+    key = ("javascript", bool(jquery), loading)
+    try:
+        return _asset_tags[key]
+    except KeyError:
+        pass
+    # NOTE: No async on scripts, it does not keep jQuery before Bootstrap. See issue #52 and #56
+    attrs = {"defer": loading == "defer", "script_type": "module" if loading == "module" else None}
+    javascript = ""
+    if jquery:
+        url = jquery_url()
+        if url:
+            javascript += render_script_tag(url, **attrs)
+    url = javascript_url()
+    if url:
+        javascript += render_script_tag(url, **attrs)
+    html = _asset_tags[key] = mark_safe(javascript)
+    return html
+
+
+def render_preload_link(url, as_type, rel="preload"):
+    """Render a preload link for a Link header, with the integrity and crossorigin of the url setting."""
+    attrs = url_to_attrs_dict(url, url_attr="url")
+    link = f"<{attrs['url']}>; rel={rel}; as={as_type}"
+    if "crossorigin" in attrs:
+        link += f"; crossorigin={attrs['crossorigin']}"
+    if "integrity" in attrs:
+        link += f'; integrity="{attrs["integrity"]}"'
+    return link
+
+
+def get_preload_links(jquery=None):
+    """Return the preload links for the assets of `render_css()` and `render_javascript()`."""
+    if jquery is None:
+        jquery = get_bootstrap_setting("include_jquery", False)
+    loading = get_javascript_loading()
+    key = ("preload", bool(jquery), loading)
+    try:
+        return _asset_tags[key]
+    except KeyError:
+        pass
+    # Module scripts are fetched differently, and need a modulepreload link to reuse the response
+    script_rel = "modulepreload" if loading == "module" else "preload"
+    urls = [(css_url(), "style", "preload"), (theme_url(), "style", "preload")]
+    if jquery:
+        urls.append((jquery_url(), "script", script_rel))
+    urls.append((javascript_url(), "script", script_rel))
+    links = _asset_tags[key] = tuple(render_preload_link(*url) for url in urls if url[0])
+    return links
+
+
+@receiver(setting_changed)
+def reset_asset_tags(*, setting, **kwargs):
+    """Discard the rendered asset tags when the settings change."""
+    if setting in ("BOOTSTRAP3", "STATIC_URL", "STORAGES"):
+        _asset_tags.clear()
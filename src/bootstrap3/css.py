@@ -0,0 +1,479 @@
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from .bootstrap import get_bootstrap_setting
+
+# At-rules that contain rules instead of declarations
+GROUPING_AT_RULES = ("@media", "@supports", "@document", "@-moz-document")
+
+# At-rules that are only kept when a kept rule refers to them
+REFERENCED_AT_RULES = ("@font-face", "@keyframes", "@-webkit-keyframes", "@-moz-keyframes", "@-o-keyframes")
+
+# Pages are rendered with these elements even if a template leaves them out
+DOCUMENT_ELEMENTS = ("html", "body")
+
+# Default marker for the end of the part of the page that is above the fold
+FOLD_MARKER = "<!-- bootstrap3:fold -->"
+
+# Classes that the renderers, forms, components and templates of django-bootstrap3 use
+LIBRARY_CSS_CLASSES = frozenset(
+    {
+        "active",
+        "alert",
+        "alert-danger",
+        "alert-dismissable",
+        "alert-info",
+        "alert-link",
+        "alert-success",
+        "alert-warning",
+        "btn",
+        "btn-default",
+        "btn-lg",
+        "btn-primary",
+        "btn-sm",
+        "btn-xs",
+        "checkbox",
+        "close",
+        "col-xs-12",
+        "col-xs-4",
+        "control-label",
+        "disabled",
+        "form-control",
+        "form-control-static",
+        "form-group",
+        "form-group-lg",
+        "form-group-sm",
+        "glyphicon",
+        "help-block",
+        "input-group",
+        "input-group-addon",
+        "input-lg",
+        "input-sm",
+        "last",
+        "next",
+        "pagination",
+        "pagination-lg",
+        "pagination-sm",
+        "prev",
+        "radio",
+        "row",
+        "sr-only",
+    }
+)
+
+# Classes that the Bootstrap JavaScript adds to elements
+JAVASCRIPT_CSS_CLASSES = frozenset(
+    {
+        "active",
+        "affix",
+        "affix-bottom",
+        "affix-top",
+        "arrow",
+        "collapse",
+        "collapsing",
+        "dropdown-backdrop",
+        "fade",
+        "in",
+        "item",
+        "left",
+        "modal-backdrop",
+        "modal-open",
+        "modal-scrollbar-measure",
+        "next",
+        "open",
+        "popover",
+        "popover-content",
+        "popover-title",
+        "prev",
+        "right",
+        "tooltip",
+        "tooltip-arrow",
+        "tooltip-inner",
+    }
+)
+
+# Prefixes of classes that are made from a value in a template, like {% bootstrap_icon "star" %}
+DYNAMIC_CLASS_PREFIXES = ("glyphicon-", "alert-", "btn-")
+
+# Settings with classes that the renderers use
+CSS_CLASS_SETTINGS = (
+    "horizontal_label_class",
+    "horizontal_field_class",
+    "required_css_class",
+    "error_css_class",
+    "success_css_class",
+)
+
+SIMPLE_SELECTOR_RE = re.compile(
+    r"""
+    (?P<pseudo>::?[-\w]+(?:\((?:[^()]|\([^()]*\))*\))?)
+    | \[\s*(?P<attr>[-\w]+)[^\]]*\]
+    | \#(?P<id>(?:[-\w]|\\.)+)
+    | \.(?P<class>(?:[-\w]|\\.)+)
+    | (?P<element>[a-zA-Z][-\w]*|\*)
+    | (?P<combinator>\s*[>+~]\s*|\s+)
+    """,
+    re.VERBOSE,
+)
+CLASS_NAME_RE = re.compile(r"[A-Za-z0-9_-]+")
+LICENSE_COMMENT_RE = re.compile(r"/\*!.*?\*/", re.DOTALL)
+FONT_FAMILY_RE = re.compile(r"font-family\s*:\s*([^;}]+)", re.IGNORECASE)
+ANIMATION_NAME_RE = re.compile(r"@(?:-\w+-)?keyframes\s+(\S+)", re.IGNORECASE)
+CSS_ESCAPE_RE = re.compile(r"\\(.)")
+URL_RE = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+PUNCTUATION_SPACE_RE = re.compile(r" ?([;:{},]) ?")
+
+
+def _skip_string(css, pos):
+    """Return the position after the string that starts at `pos`."""
+    quote = css[pos]
+    pos += 1
+    while pos < len(css):
+        char = css[pos]
+        if char == "\\":
+            pos += 2
+            continue
+        pos += 1
+        if char == quote:
+            break
+    return pos
+
+
+def strip_comments(css):
+    """Return `css` without comments, leaving strings alone."""
+    parts = []
+    start = pos = 0
+    while pos < len(css):
+        char = css[pos]
+        if char in "\"'":
+            pos = _skip_string(css, pos)
+        elif css.startswith("/*", pos):
+            parts.append(css[start:pos])
+            end = css.find("*/", pos + 2)
+            pos = start = len(css) if end == -1 else end + 2
+        else:
+            pos += 1
+    parts.append(css[start:])
+    return "".join(parts)
+
+
+def _collapse(css):
+    return PUNCTUATION_SPACE_RE.sub(r"\1", " ".join(css.split()))
+
+
+def collapse_whitespace(css):
+    """Return `css` with whitespace outside strings collapsed, and left out around punctuation."""
+    parts = []
+    start = pos = 0
+    while pos < len(css):
+        if css[pos] in "\"'":
+            end = _skip_string(css, pos)
+            parts += (_collapse(css[start:pos]), css[pos:end])
+            pos = start = end
+        else:
+            pos += 1
+    parts.append(_collapse(css[start:]))
+    return "".join(parts)
+
+
+def split_outside_brackets(text, separator):
+    """Split `text` on `separator`, except inside brackets, parentheses and strings."""
+    parts = []
+    depth = 0
+    start = pos = 0
+    while pos < len(text):
+        char = text[pos]
+        if char in "\"'":
+            pos = _skip_string(text, pos)
+            continue
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:pos])
+            start = pos + 1
+        pos += 1
+    parts.append(text[start:])
+    return parts
+
+
+def _parse_rules(css, pos, nested):
+    rules = []
+    start = pos
+    while pos < len(css):
+        char = css[pos]
+        if char in "\"'":
+            pos = _skip_string(css, pos)
+        elif char == ";":
+            # Statement at-rule, like @charset or @import
+            prelude = css[start:pos].strip()
+            if prelude:
+                rules.append((prelude, None))
+            pos = start = pos + 1
+        elif char == "{":
+            prelude = " ".join(css[start:pos].split())
+            if prelude.lower().startswith(GROUPING_AT_RULES):
+                body, pos = _parse_rules(css, pos + 1, nested=True)
+            else:
+                end = _find_block_end(css, pos + 1)
+                body = collapse_whitespace(css[pos + 1 : end]).strip()
+                pos = end + 1
+            rules.append((prelude, body))
+            start = pos
+        elif char == "}":
+            pos += 1
+            if nested:
+                return rules, pos
+            # Stray closing brace, skip it like browsers do
+            start = pos
+        else:
+            pos += 1
+    return rules, pos
+
+
+def _find_block_end(css, pos):
+    """Return the position of the brace that closes the block starting at `pos`."""
+    depth = 1
+    while pos < len(css):
+        char = css[pos]
+        if char in "\"'":
+            pos = _skip_string(css, pos)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return pos
+        pos += 1
+    return pos
+
+
+def parse_stylesheet(css):
+    """
+    Parse a stylesheet into a list of (prelude, body) rules.
+
+    The prelude is the selector list or at-rule. The body is the declarations as a string, a list of rules for
+    grouping at-rules like @media, or None for statement at-rules like @charset. This is not a validating parser,
+    but it handles everything in the Bootstrap stylesheets.
+    """
+    return _parse_rules(strip_comments(css), 0, nested=False)[0]
+
+
+def serialize_rules(rules):
+    """Return the CSS for a list of rules from `parse_stylesheet`."""
+    parts = []
+    for prelude, body in rules:
+        if body is None:
+            parts.append(f"{prelude};")
+        elif isinstance(body, list):
+            parts.append(f"{prelude}{{{serialize_rules(body)}}}")
+        else:
+            parts.append(f"{prelude}{{{body}}}")
+    return "".join(parts)
+
+
+class DocumentParser(HTMLParser):
+    """Collect the element names, classes, ids and attribute names used in a HTML document."""
+
+    def __init__(self):
+        super().__init__()
+        self.elements = set(DOCUMENT_ELEMENTS)
+        self.classes = set()
+        self.ids = set()
+        self.attributes = set()
+
+    def handle_starttag(self, tag, attrs):
+        self.elements.add(tag)
+        for name, value in attrs:
+            self.attributes.add(name)
+            if name == "class" and value:
+                self.classes.update(value.split())
+            elif name == "id" and value:
+                self.ids.add(value)
+
+
+class _Anything:
+    def __contains__(self, item):
+        return True
+
+
+class ClassDocument:
+    """A document for `selector_matches` that has the given classes, and every element, id and attribute."""
+
+    elements = ids = attributes = _Anything()
+
+    def __init__(self, classes):
+        self.classes = frozenset(classes)
+
+
+def parse_document(html):
+    """Return a `DocumentParser` that has parsed `html`."""
+    parser = DocumentParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+def selector_matches(selector, document):
+    """
+    Return whether `selector` can match an element of `document`.
+
+    Every element name, class, id and attribute in the selector must be used somewhere in the document.
+    Pseudo-classes, pseudo-elements and combinators are not checked, so this errs on the side of matching.
+    """
+    pos = 0
+    selector = selector.strip()
+    while pos < len(selector):
+        match = SIMPLE_SELECTOR_RE.match(selector, pos)
+        if match is None:
+            # Something we do not understand, keep the rule
+            return True
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "element":
+            if value != "*" and value.lower() not in document.elements:
+                return False
+        elif kind == "class":
+            if CSS_ESCAPE_RE.sub(r"\1", value) not in document.classes:
+                return False
+        elif kind == "id":
+            if CSS_ESCAPE_RE.sub(r"\1", value) not in document.ids:
+                return False
+        elif kind == "attr":
+            if value.lower() not in document.attributes:
+                return False
+    return True
+
+
+def is_print_only(prelude):
+    """Return whether a @media prelude only applies to print."""
+    for query in prelude[len("@media") :].lower().split(","):
+        words = query.split()
+        if words[:1] == ["only"]:
+            words = words[1:]
+        if words[:1] != ["print"]:
+            return False
+    return True
+
+
+def _select_rules(rules, document, print_styles=False):
+    selected = []
+    for prelude, body in rules:
+        lower_prelude = prelude.lower()
+        if body is None:
+            if lower_prelude.startswith("@charset"):
+                selected.append((prelude, body))
+        elif isinstance(body, list):
+            if not print_styles and lower_prelude.startswith("@media") and is_print_only(prelude):
+                continue
+            nested = _select_rules(body, document, print_styles)
+            if nested:
+                selected.append((prelude, nested))
+        elif lower_prelude.startswith("@"):
+            # Keep unknown at-rules, @font-face and @keyframes are decided on later
+            selected.append((prelude, body))
+        else:
+            selectors = [
+                selector.strip()
+                for selector in split_outside_brackets(prelude, ",")
+                if selector_matches(selector, document)
+            ]
+            if selectors:
+                selected.append((",".join(selectors), body))
+    return selected
+
+
+def _declarations_text(rules):
+    """Return the text of all declarations of style rules in `rules`, in lower case."""
+    texts = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            texts.append(_declarations_text(body))
+        elif body is not None and not prelude.lower().startswith(REFERENCED_AT_RULES):
+            texts.append(body.lower())
+    return " ".join(texts)
+
+
+def _drop_unreferenced(rules, declarations):
+    kept = []
+    for prelude, body in rules:
+        lower_prelude = prelude.lower()
+        if isinstance(body, list):
+            body = _drop_unreferenced(body, declarations)
+            if not body:
+                continue
+        elif lower_prelude.startswith("@font-face"):
+            families = FONT_FAMILY_RE.search(body)
+            if families is None or families.group(1).strip().strip("\"'").lower() not in declarations:
+                continue
+        elif lower_prelude.startswith(REFERENCED_AT_RULES):
+            name = ANIMATION_NAME_RE.match(prelude)
+            if name is None or name.group(1).lower() not in declarations:
+                continue
+        kept.append((prelude, body))
+    return kept
+
+
+def rebase_urls(css, base_url):
+    """Return `css` with relative URLs made relative to `base_url` instead of the stylesheet."""
+
+    def rebase(match):
+        url = match.group(2).strip()
+        if url.startswith(("data:", "#")):
+            return match.group(0)
+        return f'url("{urljoin(base_url, url)}")'
+
+    return URL_RE.sub(rebase, css)
+
+
+def extract_critical_css(css, html, fold_marker=FOLD_MARKER, base_url=None):
+    """
+    Return the rules of the stylesheet `css` that can apply to the page `html`, as CSS.
+
+    Only the part of the page before `fold_marker` is used, or the whole page if it has no marker.
+    Print styles are left out, and so are fonts and animations that the selected rules do not use.
+    Relative URLs are resolved against `base_url`, the URL the stylesheet is served from, because the
+    CSS is inlined in pages at other URLs.
+    """
+    if fold_marker and fold_marker in html:
+        html = html[: html.index(fold_marker)]
+    rules = _select_rules(parse_stylesheet(css), parse_document(html))
+    critical_css = serialize_rules(_drop_unreferenced(rules, _declarations_text(rules)))
+    if base_url:
+        critical_css = rebase_urls(critical_css, base_url)
+    return critical_css
+
+
+def get_library_css_classes():
+    """Return the classes that django-bootstrap3 renders with the current settings."""
+    classes = set(LIBRARY_CSS_CLASSES)
+    for name in CSS_CLASS_SETTINGS:
+        classes.update((get_bootstrap_setting(name) or "").split())
+    return classes
+
+
+def find_css_classes(text):
+    """
+    Return every word in `text` that could be a class, and the classes it makes with the dynamic prefixes.
+
+    This finds too many classes rather than too few, it works for templates, Python and JavaScript alike.
+    """
+    words = set(CLASS_NAME_RE.findall(text))
+    return words.union(prefix + word for word in words for prefix in DYNAMIC_CLASS_PREFIXES)
+
+
+def purge_css(css, classes):
+    """
+    Return the stylesheet `css` without the rules for classes that are not in `classes`.
+
+    Rules without classes are kept, and so are the license comments. Fonts and animations that the kept rules do
+    not use are left out.
+    """
+    rules = _select_rules(parse_stylesheet(css), ClassDocument(classes), print_styles=True)
+    purged_css = serialize_rules(_drop_unreferenced(rules, _declarations_text(rules)))
+    banner = "\n".join(LICENSE_COMMENT_RE.findall(css))
+    return f"{banner}\n{purged_css}" if banner else purged_css
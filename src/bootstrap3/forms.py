@@ -1,39 +1,20 @@
-from django.contrib.admin.widgets import AdminFileWidget
-from django.forms import (
-    CheckboxSelectMultiple,
-    EmailInput,
-    FileInput,
-    HiddenInput,
-    NumberInput,
-    PasswordInput,
-    Textarea,
-    TextInput,
-    URLInput,
-)
-from django.forms.widgets import CheckboxInput
 from django.utils.safestring import mark_safe
 
 from .bootstrap import (
-    get_bootstrap_setting,
+    get_bootstrap_settings,
     get_field_renderer,
     get_form_renderer,
     get_formset_renderer,
 )
+from .cache import render_cached_form
 from .components import render_icon
 from .exceptions import BootstrapError
 from .text import text_concat, text_value
 from .utils import add_css_class, render_tag
+from .widgets import WIDGETS_NO_REQUIRED, WIDGETS_WITH_PLACEHOLDER, get_widget_behaviour  # noqa: F401 (compatibility)
 
 FORM_GROUP_CLASS = "form-group"
 
-WIDGETS_NO_REQUIRED = (
-    AdminFileWidget,
-    HiddenInput,
-    FileInput,
-    CheckboxInput,
-    CheckboxSelectMultiple,
-)
-
 
 def render_formset(formset, **kwargs):
     """Render a formset to a Bootstrap layout."""
@@ -41,18 +22,51 @@ def render_formset(formset, **kwargs):
     return renderer_cls(formset, **kwargs).render()
 
 
+def iter_render_formset(formset, **kwargs):
+    """Render a formset to a Bootstrap layout, yielding the HTML form by form."""
+    renderer_cls = get_formset_renderer(**kwargs)
+    return renderer_cls(formset, **kwargs).iter_render()
+
+
+def render_formset_forms(formset, **kwargs):
+    """Render the forms of a formset, without errors and management form, to a Bootstrap layout."""
+    renderer_cls = get_formset_renderer(**kwargs)
+    return mark_safe(renderer_cls(formset, **kwargs).render_forms())
+
+
+def render_formset_empty_form(formset, **kwargs):
+    """Render the empty form of a formset to a Bootstrap layout, for adding forms in the browser."""
+    renderer_cls = get_formset_renderer(**kwargs)
+    return mark_safe(renderer_cls(formset, **kwargs).render_empty_form())
+
+
 def render_formset_errors(formset, **kwargs):
     """Render formset errors to a Bootstrap layout."""
     renderer_cls = get_formset_renderer(**kwargs)
     return renderer_cls(formset, **kwargs).render_errors()
 
 
-def render_form(form, **kwargs):
-    """Render a form to a Bootstrap layout."""
+def render_form(form, cache=None, **kwargs):
+    """
+    Render a form to a Bootstrap layout.
+
+    If `cache` is true, or `cache` is None and the `form_cache` setting is true, the HTML of unbound forms
+    is cached and reused.
+    """
     renderer_cls = get_form_renderer(**kwargs)
+    if cache is None:
+        cache = get_bootstrap_settings().form_cache
+    if cache:
+        return render_cached_form(renderer_cls, form, **kwargs)
     return renderer_cls(form, **kwargs).render()
 
 
+def iter_render_form(form, **kwargs):
+    """Render a form to a Bootstrap layout, yielding the HTML field by field."""
+    renderer_cls = get_form_renderer(**kwargs)
+    return renderer_cls(form, **kwargs).iter_render()
+
+
 def render_form_errors(form, error_types="non_field_errors", **kwargs):
     """Render form errors to a Bootstrap layout."""
     renderer_cls = get_form_renderer(**kwargs)
@@ -137,10 +151,11 @@ def render_button(
 def render_field_and_label(field, label, field_class="", label_for=None, label_class="", layout="", **kwargs):
     """Render a field with its label."""
     if layout == "horizontal":
+        bootstrap_settings = get_bootstrap_settings()
         if not label_class:
-            label_class = get_bootstrap_setting("horizontal_label_class")
+            label_class = bootstrap_settings.horizontal_label_class
         if not field_class:
-            field_class = get_bootstrap_setting("horizontal_field_class")
+            field_class = bootstrap_settings.horizontal_field_class
         if not label:
             label = mark_safe("&#160;")
         label_class = add_css_class(label_class, "control-label")
@@ -161,9 +176,7 @@ def is_widget_required_attribute(widget):
     """Return whether this widget is required."""
     if not widget.is_required:
         return False
-    if isinstance(widget, WIDGETS_NO_REQUIRED):
-        return False
-    return True
+    return get_widget_behaviour(type(widget))["has_required_attribute"]
 
 
 def is_widget_with_placeholder(widget):
@@ -172,4 +185,4 @@ def is_widget_with_placeholder(widget):
 
     Only text, search, url, tel, e-mail, password, number have placeholders
     """
-    return isinstance(widget, (TextInput, Textarea, NumberInput, EmailInput, URLInput, PasswordInput))
+    return get_widget_behaviour(type(widget))["has_placeholder"]
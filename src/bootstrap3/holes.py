@@ -0,0 +1,109 @@
+import re
+import secrets
+from contextvars import ContextVar
+
+from django.middleware.csrf import get_token
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.html import conditional_escape
+from django.utils.module_loading import import_string
+
+from .bootstrap import get_bootstrap_setting
+from .exceptions import BootstrapError
+
+# Markers are left alone by HTML escaping, so they survive in attribute values and text. A marker carries a
+# signature of its name and the page it was rendered for, so content that is rendered into the page cannot
+# forge one.
+HOLE_NAME = re.compile(r"^[\w.-]+$")
+HOLE_MARKER = re.compile(r"\[\[bootstrap3-hole:([\w.-]+):([0-9a-f]+)\]\]")
+
+HOLE_SIGNATURE_SALT = "bootstrap3.holes"
+
+# Path of the request that is being rendered, set by HoleMiddleware
+_hole_scope = ContextVar("bootstrap3_hole_scope", default=None)
+
+DEFAULT_CSRF_HOLE = "csrf_token"
+
+# Resolvers that are always available, the "holes" setting can add more
+DEFAULT_HOLE_RESOLVERS = {DEFAULT_CSRF_HOLE: "bootstrap3.holes.csrf_token"}
+
+
+def csrf_token(request):
+    """Return the CSRF token for the request."""
+    return get_token(request)
+
+
+def get_hole_scope():
+    """
+    Return the scope that markers are signed for, the full path of the request that is being rendered.
+
+    Outside `HoleMiddleware` every call returns a new scope, so the markers are never filled.
+    """
+    return _hole_scope.get() or secrets.token_hex(16)
+
+
+def set_hole_scope(request):
+    """Sign the markers that are rendered from now on for `request`, return a token for `reset_hole_scope()`."""
+    return _hole_scope.set(request.get_full_path())
+
+
+def reset_hole_scope(token):
+    """Go back to the scope from before `set_hole_scope()`."""
+    _hole_scope.reset(token)
+
+
+def sign_hole(name, scope):
+    """Return the signature of hole `name` in `scope`."""
+    return salted_hmac(HOLE_SIGNATURE_SALT, f"{scope}\n{name}", algorithm="sha256").hexdigest()
+
+
+def hole_marker(name):
+    """Return the marker for hole `name`, to be replaced by `fill_holes()` for the current request."""
+    if not HOLE_NAME.match(name):
+        raise BootstrapError(f'Invalid hole name "{name}", use letters, digits, "_", "." and "-".')
+    return f"[[bootstrap3-hole:{name}:{sign_hole(name, get_hole_scope())}]]"
+
+
+def parse_holes(holes):
+    """Return a dict of field name to hole name, from a dict or a string like "name=hole,email=hole"."""
+    if not holes:
+        return {}
+    if isinstance(holes, dict):
+        return holes
+    parsed = {}
+    for item in holes.replace(" ", "").split(","):
+        field_name, sep, hole = item.partition("=")
+        if not sep or not field_name or not hole:
+            raise BootstrapError(f'Invalid holes "{holes}", use "field=hole" separated by commas.')
+        parsed[field_name] = hole
+    return parsed
+
+
+def get_hole_resolver(name):
+    """Return the function that resolves hole `name` for a request, or None if there is none."""
+    resolvers = {**DEFAULT_HOLE_RESOLVERS, **get_bootstrap_setting("holes", {})}
+    resolver = resolvers.get(name, None)
+    if isinstance(resolver, str):
+        resolver = import_string(resolver)
+    return resolver
+
+
+def fill_holes(content, request):
+    """
+    Replace the hole markers in `content` that were rendered for `request` with the escaped values for `request`.
+
+    Markers with a signature for another page, or no valid signature at all, are left as they are. Markers of
+    holes without a resolver are removed.
+    """
+    scope = request.get_full_path()
+    values = {}
+
+    def resolve(match):
+        name, signature = match.groups()
+        if not constant_time_compare(signature, sign_hole(name, scope)):
+            return match.group(0)
+        if name not in values:
+            resolver = get_hole_resolver(name)
+            values[name] = "" if resolver is None else str(conditional_escape(resolver(request)))
+        return values[name]
+
+    return HOLE_MARKER.sub(resolve, content)
@@ -0,0 +1,86 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateDoesNotExist
+from django.template.loader import render_to_string
+
+from bootstrap3.bootstrap import css_url, get_bootstrap_setting, theme_url
+from bootstrap3.components import WITHOUT_CRITICAL_CSS
+from bootstrap3.css import FOLD_MARKER, extract_critical_css
+from bootstrap3.utils import url_to_attrs_dict
+
+
+class Command(BaseCommand):
+    help = (
+        "Render templates, select the rules of the Bootstrap CSS that their pages use above the fold, and write "
+        "them to a file. Point the critical_css setting to the file to inline them with {% bootstrap_critical_css %}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("templates", nargs="+", metavar="TEMPLATE", help="Name of a template to render.")
+        parser.add_argument(
+            "--css",
+            action="append",
+            required=True,
+            metavar="FILE",
+            help="Local copy of the CSS to select from, e.g. bootstrap.min.css. Repeat for the theme CSS.",
+        )
+        parser.add_argument(
+            "--base-url",
+            action="append",
+            metavar="URL",
+            help=(
+                "URL the matching --css file is served from, to resolve the relative URLs in it "
+                "(default: css_url and theme_url)."
+            ),
+        )
+        parser.add_argument("--output", help="File to write (default: the critical_css setting).")
+        parser.add_argument(
+            "--fold",
+            default=FOLD_MARKER,
+            help=f"Marker in the HTML for the end of the page above the fold (default: {FOLD_MARKER}).",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"] or get_bootstrap_setting("critical_css")
+        if not output:
+            raise CommandError("Pass --output, or set critical_css in the BOOTSTRAP3 setting.")
+        base_urls = options["base_url"] or [
+            url_to_attrs_dict(url, url_attr="url")["url"] if url else None for url in (css_url(), theme_url())
+        ]
+        stylesheets = []
+        for index, filename in enumerate(options["css"]):
+            try:
+                with open(filename, encoding="utf-8") as f:
+                    stylesheets.append((f.read(), base_urls[index] if index < len(base_urls) else None))
+            except OSError as e:
+                raise CommandError(f'Cannot read "{filename}": {e}') from e
+
+        critical_css = {}
+        if os.path.exists(output):
+            try:
+                with open(output, encoding="utf-8") as f:
+                    critical_css = json.load(f)["templates"]
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f'Cannot read "{output}": {e}') from e
+
+        for template_name in options["templates"]:
+            try:
+                # Render the page as it is without critical CSS
+                html = render_to_string(template_name, {WITHOUT_CRITICAL_CSS: True})
+            except TemplateDoesNotExist as e:
+                raise CommandError(f'Template "{template_name}" does not exist.') from e
+            except Exception as e:
+                raise CommandError(f'Cannot render "{template_name}" without context: {e}') from e
+            critical_css[template_name] = "".join(
+                extract_critical_css(css, html, fold_marker=options["fold"], base_url=base_url)
+                for css, base_url in stylesheets
+            )
+            self.stdout.write(f"{template_name}: {len(critical_css[template_name])} characters")
+
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"templates": critical_css}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output}"))
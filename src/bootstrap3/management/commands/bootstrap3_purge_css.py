@@ -0,0 +1,66 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+
+from bootstrap3.css import JAVASCRIPT_CSS_CLASSES, find_css_classes, get_library_css_classes, purge_css
+
+
+def iter_files(path):
+    """Yield `path` if it is a file, or the files below it if it is a directory."""
+    if os.path.isfile(path):
+        yield path
+        return
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            yield os.path.join(root, name)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a copy of the Bootstrap CSS without the rules for classes that neither django-bootstrap3 nor the "
+        "project templates use. Point css_url to the copy, or vendor it with bootstrap3_vendor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--css", required=True, metavar="FILE", help="Local copy of bootstrap.css to purge.")
+        parser.add_argument("--output", required=True, metavar="FILE", help="File to write the purged CSS to.")
+        parser.add_argument(
+            "--scan",
+            action="append",
+            default=[],
+            metavar="PATH",
+            help="Extra file or directory to look for classes in, e.g. Python or JavaScript that adds classes.",
+        )
+        parser.add_argument(
+            "--safelist", action="append", default=[], metavar="CLASS", help="Class to keep, can be repeated."
+        )
+        parser.add_argument(
+            "--no-templates", action="store_false", dest="templates", help="Do not look in the template directories."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["css"], encoding="utf-8") as f:
+                css = f.read()
+        except OSError as e:
+            raise CommandError(f'Cannot read "{options["css"]}": {e}') from e
+
+        classes = get_library_css_classes() | JAVASCRIPT_CSS_CLASSES | set(options["safelist"])
+        paths = list(options["scan"])
+        if options["templates"]:
+            for engine in engines.all():
+                paths.extend(str(path) for path in engine.template_dirs)
+        for path in paths:
+            if not os.path.exists(path):
+                raise CommandError(f'Cannot scan "{path}", it does not exist.')
+            for filename in iter_files(path):
+                with open(filename, encoding="utf-8", errors="ignore") as f:
+                    classes |= find_css_classes(f.read())
+
+        purged_css = purge_css(css, classes)
+        os.makedirs(os.path.dirname(os.path.abspath(options["output"])), exist_ok=True)
+        with open(options["output"], "w", encoding="utf-8") as f:
+            f.write(purged_css)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}: {len(purged_css)} of {len(css)} characters"))
@@ -0,0 +1,86 @@
+import base64
+import hashlib
+import json
+import os
+import shutil
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Command line options, and the settings they provide the URL for
+ASSETS = (
+    ("css", "css_url"),
+    ("theme", "theme_url"),
+    ("javascript", "javascript_url"),
+    ("jquery", "jquery_url"),
+)
+
+MANIFEST_NAME = "bootstrap3-manifest.json"
+
+
+def get_integrity(content):
+    """Return the Subresource Integrity value (sha384) for `content`."""
+    return "sha384-" + base64.b64encode(hashlib.sha384(content).digest()).decode("ascii")
+
+
+def get_fingerprinted_name(filename, content):
+    """Return `filename` with a fingerprint of `content` before the extension."""
+    root, ext = os.path.splitext(os.path.basename(filename))
+    if root.endswith(".min"):
+        root, ext = root[: -len(".min")], ".min" + ext
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy local Bootstrap and jQuery files to a static directory under a fingerprinted name, and write a "
+        "manifest with their paths and SRI hashes. Point the asset_manifest setting to the manifest to use them."
+    )
+
+    def add_arguments(self, parser):
+        for option, setting in ASSETS:
+            parser.add_argument(f"--{option}", metavar="FILE", help=f"File to use for {setting}.")
+        parser.add_argument(
+            "--static-dir",
+            required=True,
+            help="Static files directory to copy the files to, e.g. one of STATICFILES_DIRS.",
+        )
+        parser.add_argument(
+            "--prefix", default="bootstrap3", help="Path inside the static files directory (default: bootstrap3)."
+        )
+        parser.add_argument("--manifest", help=f"Manifest file to write (default: {MANIFEST_NAME} in the prefix).")
+        parser.add_argument(
+            "--crossorigin",
+            default="anonymous",
+            help='Value of the crossorigin attribute, use "" to leave it out (default: anonymous).',
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"].strip("/")
+        target_dir = os.path.join(options["static_dir"], *prefix.split("/"))
+        manifest_path = options["manifest"] or os.path.join(target_dir, MANIFEST_NAME)
+        assets = {}
+        for option, setting in ASSETS:
+            filename = options[option]
+            if not filename:
+                continue
+            try:
+                with open(filename, "rb") as f:
+                    content = f.read()
+            except OSError as e:
+                raise CommandError(f'Cannot read "{filename}": {e}') from e
+            name = get_fingerprinted_name(filename, content)
+            os.makedirs(target_dir, exist_ok=True)
+            shutil.copyfile(filename, os.path.join(target_dir, name))
+            assets[setting] = {
+                "path": f"{prefix}/{name}" if prefix else name,
+                "integrity": get_integrity(content),
+                "crossorigin": options["crossorigin"],
+            }
+            self.stdout.write(f"{setting}: {assets[setting]['path']}")
+        if not assets:
+            raise CommandError("Nothing to vendor, pass at least one of --css, --theme, --javascript or --jquery.")
+        os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"assets": assets}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {manifest_path}"))
@@ -0,0 +1,57 @@
+from django.middleware.csrf import CsrfViewMiddleware
+
+from .holes import fill_holes, reset_hole_scope, set_hole_scope
+from .responses import add_preload_headers
+
+HOLE_MARKER_BYTES = b"[[bootstrap3-hole:"
+
+
+class HoleMiddleware:
+    """
+    Fill in the holes of HTML responses.
+
+    Put this middleware first in ``MIDDLEWARE``, so it runs after the cache middleware has stored the
+    response with its markers. When a hole needs a CSRF token, the CSRF cookie is set here as well.
+    Markers are signed for the path of the request they were rendered for, only those are filled.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.csrf_middleware = CsrfViewMiddleware(get_response)
+
+    def __call__(self, request):
+        token = set_hole_scope(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_hole_scope(token)
+        if (
+            response.streaming
+            or not response.get("Content-Type", "").startswith("text/html")
+            or HOLE_MARKER_BYTES not in response.content
+        ):
+            return response
+        response.content = fill_holes(response.content.decode(response.charset), request)
+        if response.has_header("Content-Length"):
+            response["Content-Length"] = str(len(response.content))
+        return self.csrf_middleware.process_response(request, response)
+
+
+class PreloadMiddleware:
+    """
+    Add preload Link headers for the Bootstrap CSS and JavaScript to HTML responses.
+
+    Set ``jquery`` in a subclass to preload jQuery regardless of the ``include_jquery`` setting,
+    e.g. when all pages extend ``bootstrap3/bootstrap3.html``.
+    """
+
+    jquery = None
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.get("Content-Type", "").startswith("text/html"):
+            add_preload_headers(response, jquery=self.jquery)
+        return response
@@ -0,0 +1,162 @@
+import hashlib
+
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.utils.functional import cached_property
+
+
+def get_page_window(current_page, num_pages, pages_to_show=11):
+    """
+    Return the pages to link to for `current_page` as (first_page, last_page, pages_back, pages_forward).
+
+    The pages from `first_page` to `last_page` are shown, centered on the current page where possible.
+    `pages_back` and `pages_forward` are the pages that the ellipsis links go to, or None if there is no
+    ellipsis. The cost does not depend on `num_pages`.
+    """
+    half = pages_to_show // 2
+    first_page = max(1, current_page - half)
+    if first_page == 1:
+        # Without an ellipsis at the start there is room for one more page
+        pages_back = None
+        last_page = min(num_pages, pages_to_show + 1)
+    else:
+        pages_back = max(1, first_page - half)
+        last_page = min(num_pages, first_page + pages_to_show - 1)
+    if last_page < num_pages:
+        return first_page, last_page, pages_back, min(num_pages, last_page + half)
+    # The window reaches the last page, move its start one page back
+    if first_page > 1:
+        first_page -= 1
+    if pages_back is not None and pages_back > 1:
+        pages_back -= 1
+    else:
+        pages_back = None
+    return first_page, last_page, pages_back, None
+
+
+class CountlessPage(Page):
+    """A page of a `CountlessPaginator`, that knows if there is a next page without counting all objects."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def __repr__(self):
+        return f"<Page {self.number}>"
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        if not self._has_next:
+            raise EmptyPage(self.paginator.error_messages["no_results"])
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.paginator.validate_number(self.number - 1)
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return self.paginator.per_page * (self.number - 1) + 1
+
+    def end_index(self):
+        if not self.object_list:
+            return 0
+        return self.start_index() + len(self.object_list) - 1
+
+
+class CountlessPaginator(Paginator):
+    """
+    Paginator that never counts the objects.
+
+    Each page fetches one object more than it shows, to know if there is a next page. The number of pages
+    is unknown, so `bootstrap_pagination` renders the pages up to the next page, without a link to the last page.
+    """
+
+    count = None
+    num_pages = None
+    page_range = None
+
+    def __iter__(self):
+        number = 1
+        while True:
+            page = self.page(number)
+            yield page
+            if not page.has_next():
+                break
+            number += 1
+
+    def validate_number(self, number):
+        """Validate the given 1-based page number, without checking the upper bound."""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def get_page(self, number):
+        """Return a valid page, the first page if the page argument is not a number or is out of range."""
+        try:
+            return self.page(number)
+        except (PageNotAnInteger, EmptyPage):
+            return self.page(1)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not object_list and (number > 1 or not self.allow_empty_first_page):
+            raise EmptyPage(self.error_messages["no_results"])
+        has_next = len(object_list) > self.per_page
+        return self._get_page(object_list[: self.per_page], number, self, has_next=has_next)
+
+    def _get_page(self, *args, **kwargs):
+        return CountlessPage(*args, **kwargs)
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that stores the count of its objects in a Django cache.
+
+    The count is reused for `cache_timeout` seconds, so it can be behind. The cache key is made from the
+    SQL of a queryset, pass `cache_key` for other object lists.
+    """
+
+    def __init__(self, *args, cache_timeout=300, cache_alias="default", cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_timeout = cache_timeout
+        self.cache_alias = cache_alias
+        self.cache_key = cache_key
+
+    def get_count_cache_key(self):
+        """Return the cache key for the count, or None if the count cannot be cached."""
+        if self.cache_key:
+            return self.cache_key
+        query = getattr(self.object_list, "query", None)
+        if query is None:
+            return None
+        try:
+            sql, params = query.get_compiler(using=self.object_list.db).as_sql()
+        except EmptyResultSet:
+            return None
+        digest = hashlib.sha256(repr((self.object_list.db, sql, params)).encode()).hexdigest()
+        return f"bootstrap3.count:{digest}"
+
+    @cached_property
+    def count(self):
+        """Return the total number of objects, from the cache if possible."""
+        key = self.get_count_cache_key()
+        if key is None:
+            return Paginator.count.func(self)
+        cache = caches[self.cache_alias]
+        count = cache.get(key)
+        if count is None:
+            count = Paginator.count.func(self)
+            cache.set(key, count, self.cache_timeout)
+        return count
@@ -1,49 +1,105 @@
+import copy
 import re
+import warnings
+from functools import lru_cache
 
-from django.forms import (
-    BaseForm,
-    BaseFormSet,
-    BoundField,
-    CheckboxInput,
-    CheckboxSelectMultiple,
-    ClearableFileInput,
-    DateInput,
-    EmailInput,
-    FileInput,
-    MultiWidget,
-    NumberInput,
-    PasswordInput,
-    RadioSelect,
-    Select,
-    SelectDateWidget,
-    TextInput,
-    URLInput,
-)
+from django.core.exceptions import EmptyResultSet
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.forms import BaseForm, BaseFormSet, BoundField, ModelChoiceField, MultiWidget
 from django.utils.html import conditional_escape, escape, strip_tags
 from django.utils.safestring import mark_safe
 
-from .bootstrap import get_bootstrap_setting
+from .bootstrap import get_bootstrap_settings, get_field_renderer, get_form_renderer
 from .exceptions import BootstrapError
 from .forms import (
     FORM_GROUP_CLASS,
-    is_widget_with_placeholder,
-    render_field,
     render_form,
     render_form_group,
     render_label,
 )
+from .holes import hole_marker, parse_holes
 from .text import text_value
-from .utils import add_css_class, render_template_file
+from .utils import add_css_class, is_template_overridden, render_template_file
+from .widgets import (
+    WIDGETS_INPUT_GROUP,
+    WIDGETS_NO_FORM_CONTROL,
+    WIDGETS_WITH_HOLE,
+    WIDGETS_WITHOUT_HOLE,
+    get_widget_behaviour,
+    widget_behaviour_changed,
+)
+
+FIELD_HELP_TEXT_AND_ERRORS_TEMPLATES = (
+    "bootstrap3/field_help_text_and_errors.html",
+    "bootstrap3/field_error.html",
+    "bootstrap3/field_help_text.html",
+)
+
+FORM_ERRORS_TEMPLATE = "bootstrap3/form_errors.html"
+
+
+def render_field_help_text_and_errors(errors, help_text):
+    """Render the same HTML as the default template ``bootstrap3/field_help_text_and_errors.html``."""
+    html = [f'\n    <div class="help-block">{conditional_escape(error)}</div>\n\n' for error in errors]
+    html.append("\n")
+    if help_text:
+        html.append(f'\n    <div class="help-block">{conditional_escape(help_text)}</div>\n\n')
+    return mark_safe("".join(html))
+
+
+def render_form_errors_alert(errors):
+    """Render the same HTML as the default template ``bootstrap3/form_errors.html``."""
+    errors = list(errors)
+    last = len(errors) - 1
+    rendered_errors = [
+        f"\n        {conditional_escape(error)}{'' if i == last else '<br>'}\n    " for i, error in enumerate(errors)
+    ]
+    return mark_safe(
+        '<div class="alert alert-danger alert-dismissable alert-link">\n'
+        + '    <button class="close" type="button" data-dismiss="alert" aria-hidden="true">&#215;</button>\n'
+        + "    "
+        + "".join(rendered_errors)
+        + "\n</div>\n"
+    )
 
-try:
-    # If Django is set up without a database, importing this widget gives RuntimeError
-    from django.contrib.auth.forms import ReadOnlyPasswordHashWidget
-except RuntimeError:
-    ReadOnlyPasswordHashWidget = None
+
+def render_form_errors_template(errors, context):
+    """Render form errors, skipping the template engine if ``bootstrap3/form_errors.html`` is not overridden."""
+    if is_template_overridden(FORM_ERRORS_TEMPLATE):
+        return render_template_file(FORM_ERRORS_TEMPLATE, context=context)
+    return render_form_errors_alert(errors)
+
+
+# Attributes that contain the prefix of a form field, the prefix of a stamped form is only replaced in these
+PREFIX_ATTRIBUTES_RE = re.compile(r'(\s(?:id|name|for|aria-describedby)=")([^"]*)"')
+
+# Values of `BaseRenderer.size`
+PARSED_SIZES = ("small", "medium", "large")
 
 
 class BaseRenderer:
-    """A content renderer."""
+    """
+    A content renderer.
+
+    A renderer is created for every formset, form and field that is rendered, so the renderers keep their state in
+    slots instead of an instance dict. Subclasses that do not define ``__slots__`` get an instance dict, and can
+    set any attribute.
+    """
+
+    __slots__ = (
+        "layout",
+        "form_group_class",
+        "field_class",
+        "label_class",
+        "show_help",
+        "show_label",
+        "exclude",
+        "set_placeholder",
+        "size",
+        "horizontal_label_class",
+        "horizontal_field_class",
+    )
 
     def __init__(self, *args, **kwargs):
         self.layout = kwargs.get("layout", "")
@@ -56,14 +112,14 @@ class BaseRenderer:
 
         self.set_placeholder = kwargs.get("set_placeholder", True)
         self.size = self.parse_size(kwargs.get("size", ""))
-        self.horizontal_label_class = kwargs.get(
-            "horizontal_label_class", get_bootstrap_setting("horizontal_label_class")
-        )
-        self.horizontal_field_class = kwargs.get(
-            "horizontal_field_class", get_bootstrap_setting("horizontal_field_class")
-        )
+        bootstrap_settings = get_bootstrap_settings()
+        self.horizontal_label_class = kwargs.get("horizontal_label_class", bootstrap_settings.horizontal_label_class)
+        self.horizontal_field_class = kwargs.get("horizontal_field_class", bootstrap_settings.horizontal_field_class)
 
     def parse_size(self, size):
+        if size in PARSED_SIZES:
+            # Already parsed by the renderer of the formset or form
+            return size
         size = text_value(size).lower().strip()
         if size in ("sm", "small"):
             return "small"
@@ -86,42 +142,234 @@ class BaseRenderer:
     def render(self):
         return mark_safe(self._render())
 
+    def iter_render(self):
+        """Yield the rendered HTML in chunks, joined together the chunks are equal to `render()`."""
+        yield self.render()
+
+
+def overrides_method(renderer, base_cls, *names):
+    """Return whether the class of a renderer overrides one of the named methods of `base_cls`."""
+    renderer_cls = type(renderer)
+    return any(getattr(renderer_cls, name) is not getattr(base_cls, name) for name in names)
+
+
+def join_chunks(chunks, separator="\n"):
+    """Yield chunks with a separator between them, the lazy version of `separator.join(chunks)`."""
+    for i, chunk in enumerate(chunks):
+        yield separator + chunk if i else chunk
+
 
 class FormsetRenderer(BaseRenderer):
     """Default formset renderer."""
 
+    __slots__ = ("formset", "offset", "limit", "_empty_form", "_empty_form_html", "_shared_choices")
+
     def __init__(self, formset, *args, **kwargs):
         if not isinstance(formset, BaseFormSet):
             raise BootstrapError('Parameter "formset" should contain a valid Django Formset.')
         self.formset = formset
         super().__init__(*args, **kwargs)
+        self.offset = self.parse_window_value("offset", kwargs.get("offset"), default=0)
+        self.limit = self.parse_window_value("limit", kwargs.get("limit"), default=None)
+        self._empty_form = None
+        self._empty_form_html = None
+        # Evaluated choices of model choice fields, keyed by `get_choices_key()`
+        self._shared_choices = {}
+
+    def parse_window_value(self, name, value, default):
+        if value is None or value == "":
+            return default
+        try:
+            parsed = int(value)
+        except (TypeError, ValueError):
+            parsed = -1
+        if parsed < 0:
+            raise BootstrapError(f'Invalid value "{value}" for parameter "{name}" (expected a non-negative integer).')
+        return parsed
 
     def render_management_form(self):
         return text_value(self.formset.management_form)
 
+    def get_forms(self):
+        """
+        Return the forms to render, limited to the window set by `offset` and `limit`.
+
+        Only the forms in the window are built, unless the formset has built all of its forms already.
+        """
+        formset = self.formset
+        if not self.offset and self.limit is None:
+            return formset.forms
+        total = formset.total_form_count()
+        end = total if self.limit is None else min(total, self.offset + self.limit)
+        if "forms" in formset.__dict__:
+            return formset.forms[self.offset : end]
+        # Same as formset.forms, for the forms in the window
+        return [formset._construct_form(i, **formset.get_form_kwargs(i)) for i in range(self.offset, end)]
+
     def render_form(self, form, **kwargs):
-        return render_form(form, **kwargs)
+        # The forms of a formset differ in their prefix, caching them would only fill the form cache
+        return render_form(form, cache=False, **kwargs)
+
+    def get_form_kwargs(self):
+        return {
+            "layout": self.layout,
+            "form_group_class": self.form_group_class,
+            "field_class": self.field_class,
+            "label_class": self.label_class,
+            "show_label": self.show_label,
+            "show_help": self.show_help,
+            "exclude": self.exclude,
+            "set_placeholder": self.set_placeholder,
+            "size": self.size,
+            "horizontal_label_class": self.horizontal_label_class,
+            "horizontal_field_class": self.horizontal_field_class,
+        }
+
+    def get_empty_form(self):
+        if self._empty_form is None:
+            self._empty_form = self.formset.empty_form
+        return self._empty_form
+
+    def render_empty_form(self):
+        """Render `formset.empty_form`, with the `__prefix__` placeholder in its prefix."""
+        if self._empty_form_html is None:
+            empty_form = self.get_empty_form()
+            self._empty_form_html = self.render_form(
+                empty_form, shared_choices=self.get_shared_choices(empty_form), **self.get_form_kwargs()
+            )
+        return self._empty_form_html
+
+    def stamp_empty_form(self, index):
+        """Return the HTML of the empty form with the prefix of the form at `index` in its field attributes."""
+        placeholder = self.formset.add_prefix("__prefix__")
+        prefix = self.formset.add_prefix(index)
+        return PREFIX_ATTRIBUTES_RE.sub(
+            lambda match: f'{match[1]}{match[2].replace(placeholder, prefix)}"', self.render_empty_form()
+        )
 
-    def render_forms(self):
-        rendered_forms = []
-        for form in self.formset.forms:
-            rendered_forms.append(
-                self.render_form(
-                    form,
-                    layout=self.layout,
-                    form_group_class=self.form_group_class,
-                    field_class=self.field_class,
-                    label_class=self.label_class,
-                    show_label=self.show_label,
-                    show_help=self.show_help,
-                    exclude=self.exclude,
-                    set_placeholder=self.set_placeholder,
-                    size=self.size,
-                    horizontal_label_class=self.horizontal_label_class,
-                    horizontal_field_class=self.horizontal_field_class,
+    def get_choices_key(self, field):
+        """
+        Return a key that is equal for model choice fields with the same choices, or None.
+
+        Model choice fields only have the same choices if they render the same query, in the same
+        way. Fields whose widget choices were replaced are never shared.
+        """
+        if getattr(field.widget.choices, "field", None) is not field:
+            return None
+        queryset = field.queryset
+        try:
+            sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+        except EmptyResultSet:
+            return None
+        label_from_instance = getattr(field.label_from_instance, "__func__", field.label_from_instance)
+        key = (type(field), field.iterator, label_from_instance, field.empty_label, field.to_field_name, sql, params)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get_shared_choices(self, form):
+        """
+        Return the evaluated choices of the model choice fields of a form, keyed by field name.
+
+        Choices are evaluated once per render, and reused for every form with the same choices. This
+        saves a query per model choice field for every form in the formset.
+        """
+        shared_choices = {}
+        exclude = self.exclude.replace(" ", "").split(",")
+        for name, field in form.fields.items():
+            if not isinstance(field, ModelChoiceField) or field.widget.is_hidden or name in exclude:
+                continue
+            key = self.get_choices_key(field)
+            if key is None:
+                continue
+            try:
+                choices = self._shared_choices[key]
+            except KeyError:
+                # Iterate explicitly, list() would also run a COUNT query for the length hint
+                choices = self._shared_choices[key] = list(iter(field.widget.choices))
+            shared_choices[name] = choices
+        return shared_choices
+
+    def get_first_stamped_form_index(self):
+        """
+        Return the index of the first extra form that can be rendered from the empty form, or None.
+
+        An extra form of an unbound formset is built from the same arguments as `formset.empty_form`,
+        so it renders as the empty form with another prefix. This only holds if the formset does not
+        change how forms are built, for the forms after `min_num`, which are allowed to be empty, and
+        if the forms and fields are rendered by the renderers of django-bootstrap3 as they are.
+        """
+        formset = self.formset
+        formset_cls = type(formset)
+        if (
+            formset.is_bound
+            or overrides_method(self, FormsetRenderer, "render_form")
+            or get_form_renderer(layout=self.layout) is not FormRenderer
+            or get_field_renderer(layout=self.layout) not in (FieldRenderer, InlineFieldRenderer)
+            or formset_cls._construct_form is not BaseFormSet._construct_form
+            or formset_cls.get_form_kwargs is not BaseFormSet.get_form_kwargs
+            or formset_cls.add_fields is not BaseFormSet.add_fields
+            or formset_cls.empty_form is not BaseFormSet.empty_form
+        ):
+            return None
+        return max(formset.initial_form_count(), formset.min_num)
+
+    def get_form_signature(self, form):
+        """Return what makes the HTML of an unbound form differ, apart from its prefix, or None if unknown."""
+        signature = [
+            type(form),
+            form.auto_id,
+            form.empty_permitted,
+            form.use_required_attribute,
+            form.label_suffix,
+            form.error_class,
+            form.initial,
+        ]
+        for name, field in form.fields.items():
+            if callable(field.initial) or callable(form.initial.get(name)):
+                # Every call may give a different value
+                return None
+            widget = field.widget
+            widgets = widget.widgets if isinstance(widget, MultiWidget) else ()
+            if not all(get_widget_behaviour(type(w))["stampable"] for w in (widget, *widgets)):
+                # The widget may use its id or name outside the attributes that are stamped
+                return None
+            signature.append(
+                (
+                    name,
+                    type(field),
+                    field.label,
+                    field.label_suffix,
+                    field.help_text,
+                    field.required,
+                    field.disabled,
+                    field.initial,
                 )
             )
-        return "\n".join(rendered_forms)
+            choices = getattr(widget, "choices", None)
+            if isinstance(field, ModelChoiceField):
+                choices = self.get_choices_key(field) or choices
+            signature.append((type(widget), widget.attrs, choices))
+        return signature
+
+    def iter_render_forms(self):
+        form_kwargs = self.get_form_kwargs()
+        first_stamped_index = self.get_first_stamped_form_index()
+        empty_form_signature = None
+        for index, form in enumerate(self.get_forms(), start=self.offset):
+            if first_stamped_index is not None and index >= first_stamped_index:
+                if empty_form_signature is None:
+                    empty_form_signature = self.get_form_signature(self.get_empty_form()) or False
+                if empty_form_signature and self.get_form_signature(form) == empty_form_signature:
+                    # Render the empty form once, and use it for all the extra forms
+                    yield self.stamp_empty_form(index)
+                    continue
+            yield self.render_form(form, shared_choices=self.get_shared_choices(form), **form_kwargs)
+
+    def render_forms(self):
+        return "\n".join(self.iter_render_forms())
 
     def get_formset_errors(self):
         return self.formset.non_form_errors()
@@ -129,8 +377,8 @@ class FormsetRenderer(BaseRenderer):
     def render_errors(self):
         formset_errors = self.get_formset_errors()
         if formset_errors:
-            return render_template_file(
-                "bootstrap3/form_errors.html",
+            return render_form_errors_template(
+                formset_errors,
                 context={"errors": formset_errors, "form": self.formset, "layout": self.layout},
             )
         return ""
@@ -138,10 +386,31 @@ class FormsetRenderer(BaseRenderer):
     def _render(self):
         return f"{self.render_errors()}{self.render_management_form()}{self.render_forms()}"
 
+    def iter_render(self):
+        """Yield the errors, the management form and then each form as soon as it is rendered."""
+        if overrides_method(self, FormsetRenderer, "render", "_render", "render_forms"):
+            # A subclass puts the formset together in its own way, only render() gives its HTML
+            yield self.render()
+            return
+        yield self.render_errors()
+        yield self.render_management_form()
+        yield from join_chunks(self.iter_render_forms())
+
 
 class FormRenderer(BaseRenderer):
     """Default form renderer."""
 
+    __slots__ = (
+        "form",
+        "error_types",
+        "error_css_class",
+        "required_css_class",
+        "bound_css_class",
+        "shared_choices",
+        "holes",
+        "_field_kwargs",
+    )
+
     def __init__(self, form, *args, **kwargs):
         if not isinstance(form, BaseForm):
             raise BootstrapError('Parameter "form" should contain a valid Django Form.')
@@ -151,30 +420,42 @@ class FormRenderer(BaseRenderer):
         self.error_css_class = kwargs.get("error_css_class", None)
         self.required_css_class = kwargs.get("required_css_class", None)
         self.bound_css_class = kwargs.get("bound_css_class", None)
+        self.shared_choices = kwargs.get("shared_choices", None)
+        self.holes = parse_holes(kwargs.get("holes", None))
+        self._field_kwargs = None
+
+    def get_field_kwargs(self):
+        """Return the options for the field renderers, built once and shared by all fields of the form."""
+        if self._field_kwargs is None:
+            self._field_kwargs = {
+                "layout": self.layout,
+                "form_group_class": self.form_group_class,
+                "field_class": self.field_class,
+                "label_class": self.label_class,
+                "show_label": self.show_label,
+                "show_help": self.show_help,
+                "exclude": self.exclude,
+                "set_placeholder": self.set_placeholder,
+                "size": self.size,
+                "horizontal_label_class": self.horizontal_label_class,
+                "horizontal_field_class": self.horizontal_field_class,
+                "error_css_class": self.error_css_class,
+                "required_css_class": self.required_css_class,
+                "bound_css_class": self.bound_css_class,
+                "shared_choices": self.shared_choices,
+            }
+        return self._field_kwargs
+
+    def iter_render_fields(self):
+        field_kwargs = self.get_field_kwargs()
+        # Same as render_field(), with the renderer class looked up once per form
+        renderer_cls = get_field_renderer(**field_kwargs)
+        holes = self.holes
+        for field in self.form:
+            yield renderer_cls(field, hole=holes.get(field.name, None), **field_kwargs).render()
 
     def render_fields(self):
-        rendered_fields = []
-        for field in self.form:
-            rendered_fields.append(
-                render_field(
-                    field,
-                    layout=self.layout,
-                    form_group_class=self.form_group_class,
-                    field_class=self.field_class,
-                    label_class=self.label_class,
-                    show_label=self.show_label,
-                    show_help=self.show_help,
-                    exclude=self.exclude,
-                    set_placeholder=self.set_placeholder,
-                    size=self.size,
-                    horizontal_label_class=self.horizontal_label_class,
-                    horizontal_field_class=self.horizontal_field_class,
-                    error_css_class=self.error_css_class,
-                    required_css_class=self.required_css_class,
-                    bound_css_class=self.bound_css_class,
-                )
-            )
-        return "\n".join(rendered_fields)
+        return "\n".join(self.iter_render_fields())
 
     def get_fields_errors(self):
         form_errors = []
@@ -195,8 +476,8 @@ class FormRenderer(BaseRenderer):
             raise Exception(f'Illegal value "{error_types}" for error_types.')
 
         if form_errors:
-            return render_template_file(
-                "bootstrap3/form_errors.html",
+            return render_form_errors_template(
+                form_errors,
                 context={"errors": form_errors, "form": self.form, "layout": self.layout, "error_types": error_types},
             )
 
@@ -205,12 +486,99 @@ class FormRenderer(BaseRenderer):
     def _render(self):
         return self.render_errors(self.error_types) + self.render_fields()
 
+    def iter_render(self):
+        """Yield the errors and then each field as soon as it is rendered."""
+        if overrides_method(self, FormRenderer, "render", "_render", "render_fields"):
+            # A subclass puts the form together in its own way, only render() gives its HTML
+            yield self.render()
+            return
+        yield self.render_errors(self.error_types)
+        yield from join_chunks(self.iter_render_fields())
+
+
+class WidgetPlan:
+    """
+    The widget dependent steps of rendering a field.
+
+    Most of the plan is the behaviour registered for the widget class in `bootstrap3.widgets`. Field renderer
+    classes that override one of the ``WIDGETS_*`` tuples decide on that part with the tuple. A plan is built
+    once per field renderer class and widget class, and reused for every field rendered with that combination.
+    """
+
+    __slots__ = (
+        "form_control_class",
+        "add_size_class",
+        "is_multi_widget",
+        "is_checkbox",
+        "has_placeholder",
+        "has_input_group",
+        "has_hole",
+        "post_render",
+    )
+
+    def __init__(self, renderer_cls, widget_cls):
+        behaviour = get_widget_behaviour(widget_cls)
+        self.form_control_class = behaviour["form_control_class"]
+        self.add_size_class = behaviour["add_size_class"]
+        no_form_control = renderer_cls.WIDGETS_NO_FORM_CONTROL
+        if no_form_control is not WIDGETS_NO_FORM_CONTROL and self.form_control_class != "form-control-static":
+            self.add_size_class = not issubclass(widget_cls, no_form_control)
+            self.form_control_class = "form-control" if self.add_size_class else ""
+        self.is_multi_widget = behaviour["is_multi_widget"]
+        self.is_checkbox = behaviour["is_checkbox"]
+        self.has_placeholder = behaviour["has_placeholder"]
+        self.has_input_group = behaviour["has_input_group"]
+        if renderer_cls.WIDGETS_INPUT_GROUP is not WIDGETS_INPUT_GROUP:
+            self.has_input_group = issubclass(widget_cls, renderer_cls.WIDGETS_INPUT_GROUP)
+        self.has_hole = behaviour["has_hole"]
+        with_hole, without_hole = renderer_cls.WIDGETS_WITH_HOLE, renderer_cls.WIDGETS_WITHOUT_HOLE
+        if with_hole is not WIDGETS_WITH_HOLE or without_hole is not WIDGETS_WITHOUT_HOLE:
+            self.has_hole = issubclass(widget_cls, with_hole) and not issubclass(widget_cls, without_hole)
+        # Name and extra arguments of the post render method, or a function, if any
+        self.post_render = behaviour["post_render"]
+
+
+# Maximum number of cached widget plans, there is one for every field renderer class and widget class that is used
+WIDGET_PLAN_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=WIDGET_PLAN_CACHE_SIZE)
+def get_widget_plan(renderer_cls, widget_cls):
+    """Return the widget plan for a field renderer class and a widget class, built once per combination."""
+    return WidgetPlan(renderer_cls, widget_cls)
+
 
 class FieldRenderer(BaseRenderer):
     """Default field renderer."""
 
+    __slots__ = (
+        "field",
+        "widget",
+        "widget_plan",
+        "is_multi_widget",
+        "field_help",
+        "field_errors",
+        "hole",
+        "label",
+        "placeholder",
+        "addon_before",
+        "addon_after",
+        "addon_before_class",
+        "addon_after_class",
+        "error_css_class",
+        "required_css_class",
+        "success_css_class",
+    )
+
     # These widgets will not be wrapped in a form-control class
-    WIDGETS_NO_FORM_CONTROL = (CheckboxInput, RadioSelect, CheckboxSelectMultiple, FileInput)
+    WIDGETS_NO_FORM_CONTROL = WIDGETS_NO_FORM_CONTROL
+
+    # These widgets can be wrapped in an input group with addons
+    WIDGETS_INPUT_GROUP = WIDGETS_INPUT_GROUP
+
+    # Widgets that render their value as text, so a hole marker can take the place of the value
+    WIDGETS_WITH_HOLE = WIDGETS_WITH_HOLE
+    WIDGETS_WITHOUT_HOLE = WIDGETS_WITHOUT_HOLE
 
     def __init__(self, field, *args, **kwargs):
         if not isinstance(field, BoundField):
@@ -218,18 +586,30 @@ class FieldRenderer(BaseRenderer):
         self.field = field
         super().__init__(*args, **kwargs)
 
-        self.widget = field.field.widget
-        self.is_multi_widget = isinstance(field.field.widget, MultiWidget)
-        self.initial_attrs = self.widget.attrs.copy()
+        # Work on a copy of the widget, rendering must not change the widget of the form
+        self.widget = self.copy_widget(field.field.widget)
+        self.widget_plan = self.get_widget_plan(self.widget)
+        self.is_multi_widget = self.widget_plan.is_multi_widget
+        shared_choices = kwargs.get("shared_choices", None)
+        if shared_choices and field.name in shared_choices:
+            # Choices that were already evaluated for another form in the same formset
+            self.widget.choices = shared_choices[field.name]
         self.field_help = text_value(mark_safe(field.help_text)) if self.show_help and field.help_text else ""
         self.field_errors = [conditional_escape(text_value(error)) for error in field.errors]
+        self.hole = kwargs.get("hole", None)
+        if self.hole and not self.widget_plan.has_hole:
+            raise BootstrapError(f'Field "{field.name}" cannot be rendered with a hole, its widget has no text value.')
+        if field.form.is_bound:
+            # A bound form shows the submitted data, such a page is not cached and needs no hole
+            self.hole = None
 
         self.label = kwargs.get("label", field.label)
+        bootstrap_settings = get_bootstrap_settings()
 
         if "placeholder" in kwargs:
             # Find the placeholder in kwargs, even if it's empty
             self.placeholder = kwargs["placeholder"]
-        elif get_bootstrap_setting("set_placeholder"):
+        elif bootstrap_settings.set_placeholder:
             # If not found, see if we set the label
             self.placeholder = self.label
         else:
@@ -255,50 +635,70 @@ class FieldRenderer(BaseRenderer):
         if error_css_class is not None:
             self.error_css_class = error_css_class
         else:
-            self.error_css_class = getattr(field.form, "error_css_class", get_bootstrap_setting("error_css_class"))
+            self.error_css_class = getattr(field.form, "error_css_class", bootstrap_settings.error_css_class)
         if required_css_class is not None:
             self.required_css_class = required_css_class
         else:
-            self.required_css_class = getattr(
-                field.form, "required_css_class", get_bootstrap_setting("required_css_class")
-            )
+            self.required_css_class = getattr(field.form, "required_css_class", bootstrap_settings.required_css_class)
         if bound_css_class is not None:
             self.success_css_class = bound_css_class
         else:
-            self.success_css_class = getattr(field.form, "bound_css_class", get_bootstrap_setting("success_css_class"))
+            self.success_css_class = getattr(field.form, "bound_css_class", bootstrap_settings.success_css_class)
 
         # If the form is marked as form.empty_permitted, do not set required class
         if self.field.form.empty_permitted:
             self.required_css_class = ""
 
+    def get_widget_plan(self, widget):
+        return get_widget_plan(type(self), type(widget))
+
+    @property
+    def initial_attrs(self):
+        """Return the attrs of the widget of the form, which rendering leaves alone (deprecated)."""
+        warnings.warn(
+            "FieldRenderer.initial_attrs is deprecated, use field.field.widget.attrs.", DeprecationWarning, stacklevel=2
+        )
+        return self.field.field.widget.attrs.copy()
+
     def restore_widget_attrs(self):
-        self.widget.attrs = self.initial_attrs.copy()
+        """Do nothing, fields are rendered with a private copy of the widget (deprecated)."""
+        warnings.warn(
+            "FieldRenderer.restore_widget_attrs() is deprecated and does nothing, rendering uses a copy of the widget.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+    def copy_widget(self, widget):
+        """Return a shallow copy of a widget with its own attrs (and subwidgets, for a MultiWidget)."""
+        widget = copy.copy(widget)
+        widget.attrs = widget.attrs.copy()
+        if isinstance(widget, MultiWidget):
+            widget.widgets = [self.copy_widget(subwidget) for subwidget in widget.widgets]
+        return widget
 
     def add_class_attrs(self, widget=None):
         if widget is None:
             widget = self.widget
+        plan = self.get_widget_plan(widget)
         classes = widget.attrs.get("class", "")
-        if ReadOnlyPasswordHashWidget is not None and isinstance(widget, ReadOnlyPasswordHashWidget):
-            # Render this is a static control
-            classes = add_css_class(classes, "form-control-static", prepend=True)
-        elif not isinstance(widget, self.WIDGETS_NO_FORM_CONTROL):
-            classes = add_css_class(classes, "form-control", prepend=True)
-            # For these widget types, add the size class here
-            classes = add_css_class(classes, self.get_size_class())
+        if plan.form_control_class:
+            classes = add_css_class(classes, plan.form_control_class, prepend=True)
+            if plan.add_size_class:
+                classes = add_css_class(classes, self.get_size_class())
         widget.attrs["class"] = classes
 
     def add_placeholder_attrs(self, widget=None):
         if widget is None:
             widget = self.widget
         placeholder = widget.attrs.get("placeholder", self.placeholder)
-        if placeholder and self.set_placeholder and is_widget_with_placeholder(widget):
+        if placeholder and self.set_placeholder and self.get_widget_plan(widget).has_placeholder:
             # TODO: Should this be stripped and/or escaped?
             widget.attrs["placeholder"] = placeholder
 
     def add_help_attrs(self, widget=None):
         if widget is None:
             widget = self.widget
-        if not isinstance(widget, CheckboxInput):
+        if not self.get_widget_plan(widget).is_checkbox:
             widget.attrs["title"] = widget.attrs.get("title", escape(strip_tags(self.field_help)))
 
     def add_widget_attrs(self):
@@ -348,30 +748,36 @@ class FieldRenderer(BaseRenderer):
         # TODO This needs improvement
         return f'<div class="row bootstrap3-multi-input"><div class="col-xs-12">{html}</div></div>'
 
+    def render_widget(self, attrs=None):
+        """Render the widget, with the marker of the hole instead of the value of the field if there is a hole."""
+        if not self.hole:
+            return self.field.as_widget(widget=self.widget, attrs=attrs)
+        field = self.field
+        attrs = field.build_widget_attrs(dict(attrs or {}), self.widget)
+        if field.auto_id and "id" not in self.widget.attrs:
+            attrs.setdefault("id", field.auto_id)
+        return self.widget.render(
+            name=field.html_name, value=hole_marker(self.hole), attrs=attrs, renderer=field.form.renderer
+        )
+
     def post_widget_render(self, html):
-        if isinstance(self.widget, CheckboxSelectMultiple):
-            html = self.list_to_class(html, "checkbox")
-        elif isinstance(self.widget, RadioSelect):
-            html = self.list_to_class(html, "radio")
-        elif isinstance(self.widget, SelectDateWidget):
-            html = self.fix_date_select_input(html)
-        elif isinstance(self.widget, ClearableFileInput):
-            html = self.fix_clearable_file_input(html)
-        elif isinstance(self.widget, CheckboxInput):
-            html = self.put_inside_label(html)
+        post_render = self.widget_plan.post_render
+        if callable(post_render):
+            html = post_render(self, html)
+        elif post_render:
+            method, *args = post_render
+            html = getattr(self, method)(html, *args)
         return html
 
     def wrap_widget(self, html):
-        if isinstance(self.widget, CheckboxInput):
+        if self.widget_plan.is_checkbox:
             # Wrap checkboxes
             # Note checkboxes do not get size classes, see #318
             html = f'<div class="checkbox">{html}</div>'
         return html
 
     def make_input_group(self, html):
-        if (self.addon_before or self.addon_after) and isinstance(
-            self.widget, (TextInput, NumberInput, EmailInput, URLInput, DateInput, Select, PasswordInput)
-        ):
+        if (self.addon_before or self.addon_after) and self.widget_plan.has_input_group:
             before = f'<span class="{self.addon_before_class}">{self.addon_before}</span>' if self.addon_before else ""
             after = f'<span class="{self.addon_after_class}">{self.addon_after}</span>' if self.addon_after else ""
             html = f'<div class="input-group">{before}{html}{after}</div>'
@@ -383,17 +789,20 @@ class FieldRenderer(BaseRenderer):
             help_text_and_errors.append(self.field_help)
         help_text_and_errors += self.field_errors
         if help_text_and_errors:
-            help_html = render_template_file(
-                "bootstrap3/field_help_text_and_errors.html",
-                context={
-                    "field": self.field,
-                    "errors": self.field_errors,
-                    "help_text": self.field_help,
-                    "help_text_and_errors": help_text_and_errors,
-                    "layout": self.layout,
-                    "show_help": self.show_help,
-                },
-            )
+            if any(is_template_overridden(template) for template in FIELD_HELP_TEXT_AND_ERRORS_TEMPLATES):
+                help_html = render_template_file(
+                    FIELD_HELP_TEXT_AND_ERRORS_TEMPLATES[0],
+                    context={
+                        "field": self.field,
+                        "errors": self.field_errors,
+                        "help_text": self.field_help,
+                        "help_text_and_errors": help_text_and_errors,
+                        "layout": self.layout,
+                        "show_help": self.show_help,
+                    },
+                )
+            else:
+                help_html = render_field_help_text_and_errors(self.field_errors, self.field_help)
             html += help_html
         return html
 
@@ -419,7 +828,7 @@ class FieldRenderer(BaseRenderer):
         return add_css_class(label_class, "control-label")
 
     def get_label(self):
-        if isinstance(self.widget, CheckboxInput):
+        if self.widget_plan.is_checkbox:
             label = None
         else:
             label = self.label
@@ -456,11 +865,10 @@ class FieldRenderer(BaseRenderer):
             return ""
         # Hidden input requires no special treatment
         if self.field.is_hidden:
-            return text_value(self.field)
+            return self.render_widget() if self.hole else text_value(self.field)
         # Render the widget
         self.add_widget_attrs()
-        html = self.field.as_widget(attrs=self.widget.attrs)
-        self.restore_widget_attrs()
+        html = self.render_widget(attrs=self.widget.attrs)
         # Start post render
         html = self.post_widget_render(html)
         html = self.wrap_widget(html)
@@ -475,6 +883,8 @@ class FieldRenderer(BaseRenderer):
 class InlineFieldRenderer(FieldRenderer):
     """Inline field renderer."""
 
+    __slots__ = ()
+
     def add_error_attrs(self):
         field_title = self.widget.attrs.get("title", "")
         field_title += " " + " ".join([strip_tags(e) for e in self.field_errors])
@@ -492,3 +902,16 @@ class InlineFieldRenderer(FieldRenderer):
 
     def get_label_class(self):
         return add_css_class(self.label_class, "sr-only")
+
+
+@receiver(widget_behaviour_changed)
+def reset_widget_plans(**kwargs):
+    """Discard the widget plans when the widget behaviour they are built from changes."""
+    get_widget_plan.cache_clear()
+
+
+@receiver(setting_changed)
+def reset_widget_plans_on_setting_changed(*, setting, **kwargs):
+    """Discard the widget plans with the other cached renderer state when the settings change."""
+    if setting == "BOOTSTRAP3":
+        get_widget_plan.cache_clear()
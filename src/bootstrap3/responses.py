@@ -0,0 +1,74 @@
+from django.http import HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+
+from .components import get_preload_links
+from .exceptions import BootstrapError
+from .forms import iter_render_formset, render_formset_forms
+
+
+def streaming_formset_response(formset, head="", tail="", content_type=None, **kwargs):
+    """
+    Return a StreamingHttpResponse that sends a formset to the client form by form.
+
+    The response consists of `head`, the formset and `tail`. The formset is rendered by the
+    configured formset renderer, the other keyword arguments are passed to that renderer.
+
+    **Example**::
+
+        def bulk_edit(request):
+            formset = ItemFormSet(queryset=Item.objects.all())
+            head, tail = render_to_string("items/bulk_edit.html", request=request).split("<!-- formset -->")
+            return streaming_formset_response(formset, head=head, tail=tail, layout="inline")
+    """
+
+    def chunks():
+        yield head
+        yield from iter_render_formset(formset, **kwargs)
+        yield tail
+
+    return StreamingHttpResponse(chunks(), content_type=content_type)
+
+
+def formset_fragment_response(request, formset, **kwargs):
+    """
+    Return an HttpResponse with the HTML of a range of forms in a formset.
+
+    The range is read from the GET parameters ``offset`` (default 0) and ``limit`` (default 1),
+    so the client can load rows of a windowed ``{% bootstrap_formset %}`` when they are needed.
+    The limit is at most ``formset.max_num``. Invalid values result in a HttpResponseBadRequest.
+    The other keyword arguments are passed to the formset renderer, use the same ones as the page
+    that renders the window.
+
+    **Example**::
+
+        def item_rows(request):
+            formset = ItemFormSet(queryset=Item.objects.all())
+            return formset_fragment_response(request, formset, layout="inline")
+    """
+    kwargs.setdefault("offset", request.GET.get("offset", 0))
+    limit = kwargs.setdefault("limit", request.GET.get("limit", 1))
+    try:
+        # Do not let a client build more forms than the formset allows
+        kwargs["limit"] = min(int(limit), formset.max_num)
+    except (TypeError, ValueError):
+        # The renderer rejects the value
+        pass
+    try:
+        html = render_formset_forms(formset, **kwargs)
+    except BootstrapError as e:
+        return HttpResponseBadRequest(str(e))
+    return HttpResponse(html)
+
+
+def add_preload_headers(response, jquery=None):
+    """
+    Add ``Link: <...>; rel=preload`` headers for the Bootstrap CSS and JavaScript to a response.
+
+    Browsers start to fetch the assets as soon as they get the headers. Servers and CDNs that support
+    HTTP 103 Early Hints can send these headers before the response is ready. Existing Link headers
+    are kept.
+    """
+    links = get_preload_links(jquery=jquery)
+    if links:
+        existing = response.get("Link")
+        response["Link"] = ", ".join((existing, *links) if existing else links)
+    return response
@@ -1,14 +1,22 @@
 import re
-from math import floor
 
 from django import template
 from django.contrib.messages import constants as message_constants
 from django.template import Context
+from django.template.base import render_value_in_context
 from django.utils.encoding import force_str
+from django.utils.html import conditional_escape, format_html
 from django.utils.safestring import mark_safe
 
 from ..bootstrap import css_url, get_bootstrap_setting, javascript_url, jquery_url, theme_url
-from ..components import render_alert, render_icon
+from ..components import (
+    WITHOUT_CRITICAL_CSS,
+    render_alert,
+    render_critical_css,
+    render_css,
+    render_icon,
+    render_javascript,
+)
 from ..forms import (
     render_button,
     render_field,
@@ -17,18 +25,31 @@ from ..forms import (
     render_form_errors,
     render_form_group,
     render_formset,
+    render_formset_empty_form,
     render_formset_errors,
     render_label,
 )
+from ..holes import DEFAULT_CSRF_HOLE, hole_marker
+from ..pagination import get_page_window
 from ..utils import (
     handle_var,
+    is_template_overridden,
     parse_token_contents,
-    render_link_tag,
-    render_script_tag,
     render_template_file,
+    url_param_replacer,
     url_replace_param,
 )
 
+MESSAGES_TEMPLATE = "bootstrap3/messages.html"
+
+# The markup of a single message in MESSAGES_TEMPLATE
+MESSAGE_HTML = (
+    '\n    <div class="{classes} alert-dismissable">\n'
+    '        <button type="button" class="close" data-dismiss="alert" aria-hidden="true">&#215;</button>\n'
+    "        {message}\n"
+    "    </div>\n"
+)
+
 MESSAGE_LEVEL_CLASSES = {
     message_constants.DEBUG: "alert alert-warning",
     message_constants.INFO: "alert alert-info",
@@ -194,14 +215,39 @@ def bootstrap_css():
 
         {% bootstrap_css %}
     """
-    rendered_urls = [render_link_tag(bootstrap_css_url())]
-    if bootstrap_theme_url():
-        rendered_urls.append(render_link_tag(bootstrap_theme_url()))
-    return mark_safe("".join([url for url in rendered_urls]))
+    return render_css()
+
+
+@register.simple_tag(takes_context=True)
+def bootstrap_critical_css(context):
+    """
+    Return HTML for Bootstrap CSS, with the critical CSS of the page inline.
+
+    The critical CSS of the template that is rendered is read from the file in the ``critical_css`` setting,
+    which is written by the ``bootstrap3_critical_css`` management command. It is rendered in a ``<style>``
+    element, and the full Bootstrap CSS is loaded without blocking rendering. Without critical CSS for the
+    template, or while the management command renders the template, this is the same as ``bootstrap_css``.
+
+    **Tag name**::
+
+        bootstrap_critical_css
+
+    **Usage**::
+
+        {% bootstrap_critical_css %}
+
+    **Example**::
+
+        {% bootstrap_critical_css %}
+    """
+    if context.get(WITHOUT_CRITICAL_CSS):
+        return render_css()
+    template = getattr(context, "template", None)
+    return render_critical_css(getattr(template, "name", None))
 
 
 @register.simple_tag
-def bootstrap_javascript(jquery=None):
+def bootstrap_javascript(jquery=None, loading=None):
     """
     Return HTML for Bootstrap JavaScript.
 
@@ -220,6 +266,12 @@ def bootstrap_javascript(jquery=None):
     **Parameters**:
 
         :jquery: Truthy to include jQuery as well as Bootstrap
+        :loading: ``"defer"`` to load the scripts with the ``defer`` attribute, ``"module"`` to load them as
+            module scripts. Both keep jQuery before Bootstrap and do not block parsing, so the scripts can go in
+            ``<head>``. Inline scripts run before deferred scripts, so inline scripts that use ``$`` or ``jQuery``
+            (e.g. in the ``bootstrap3_extra_script`` block) must wait for ``DOMContentLoaded``.
+
+            :default: ``None`` (blocking scripts). Can be changed :doc:`settings`
 
     **Usage**::
 
@@ -228,20 +280,9 @@ def bootstrap_javascript(jquery=None):
     **Example**::
 
         {% bootstrap_javascript jquery=1 %}
+        {% bootstrap_javascript jquery=1 loading="defer" %}
     """
-    javascript = ""
-    # See if we have to include jQuery
-    if jquery is None:
-        jquery = get_bootstrap_setting("include_jquery", False)
-    # NOTE: No async on scripts, not mature enough. See issue #52 and #56
-    if jquery:
-        url = bootstrap_jquery_url()
-        if url:
-            javascript += render_script_tag(url)
-    url = bootstrap_javascript_url()
-    if url:
-        javascript += render_script_tag(url)
-    return mark_safe(javascript)
+    return render_javascript(jquery=jquery, loading=loading)
 
 
 @register.simple_tag
@@ -258,6 +299,15 @@ def bootstrap_formset(*args, **kwargs):
         formset
             The formset that is being rendered
 
+        offset
+            Index of the first form to render. The management form always describes the whole formset.
+
+            :default: ``0``
+
+        limit
+            Maximum number of forms to render, starting at ``offset``.
+
+            :default: ``None`` (render all forms)
 
         See bootstrap_field_ for other arguments
 
@@ -268,10 +318,41 @@ def bootstrap_formset(*args, **kwargs):
     **Example**::
 
         {% bootstrap_formset formset layout='horizontal' %}
+        {% bootstrap_formset formset offset=0 limit=50 %}
     """
     return render_formset(*args, **kwargs)
 
 
+@register.simple_tag
+def bootstrap_formset_empty_form(*args, **kwargs):
+    """
+    Render the empty form of a formset.
+
+    The prefix of the rendered form contains the placeholder ``__prefix__``. Replace it with the
+    index of the new form to add a form in the browser, without a request to the server.
+
+    **Tag name**::
+
+        bootstrap_formset_empty_form
+
+    **Parameters**:
+
+        formset
+            The formset that is being rendered
+
+        See bootstrap_field_ for other arguments
+
+    **Usage**::
+
+        {% bootstrap_formset_empty_form formset %}
+
+    **Example**::
+
+        <template id="empty-form">{% bootstrap_formset_empty_form formset layout='inline' %}</template>
+    """
+    return render_formset_empty_form(*args, **kwargs)
+
+
 @register.simple_tag
 def bootstrap_formset_errors(*args, **kwargs):
     """
@@ -326,6 +407,18 @@ def bootstrap_form(*args, **kwargs):
 
             Default is "non_field_errors".
 
+        cache
+            Cache the HTML of the form and reuse it the next time the same unbound form is rendered.
+            Bound forms, forms with initial data (also when set on their fields in ``__init__``), forms with
+            choices from the database, forms with holes and the forms of a formset are never cached.
+
+            Default is the value of the ``form_cache`` setting.
+
+        holes
+            Field names and hole names (comma separated) of fields that are rendered with a hole,
+            see the ``hole`` argument of bootstrap_field_.
+            E.g. holes=email=user_email,name=user_name
+
         See bootstrap_field_ for other arguments
 
     **Usage**::
@@ -493,6 +586,11 @@ def bootstrap_field(*args, **kwargs):
 
             :default: ``'has-success'``. Can be changed :doc:`settings`
 
+        hole
+            Render a marker instead of the value of the field, to be filled in by
+            ``bootstrap3.middleware.HoleMiddleware`` with the resolver of this hole name.
+            Only fields with a text value can have a hole, the hole is ignored for bound forms.
+
     **Usage**::
 
         {% bootstrap_field field %}
@@ -604,6 +702,54 @@ def bootstrap_button(*args, **kwargs):
     return render_button(*args, **kwargs)
 
 
+@register.simple_tag
+def bootstrap_hole(name):
+    """
+    Render the marker of a hole.
+
+    ``bootstrap3.middleware.HoleMiddleware`` replaces the marker with the value of the resolver of
+    the hole for the current request, after the cache middleware. This keeps per-user values out of
+    cached pages.
+
+    **Tag name**::
+
+        bootstrap_hole
+
+    **Parameters**:
+
+        name
+            Name of the hole, a key of the ``holes`` setting
+
+    **Usage**::
+
+        {% bootstrap_hole name %}
+
+    **Example**::
+
+        <p>Logged in as {% bootstrap_hole "username" %}</p>
+    """
+    return mark_safe(hole_marker(name))
+
+
+@register.simple_tag
+def bootstrap_csrf_hole():
+    """
+    Render the CSRF token input of a form, with a hole instead of the token.
+
+    Unlike ``{% csrf_token %}``, this does not make the response vary on the CSRF cookie, so the
+    page can be cached. ``bootstrap3.middleware.HoleMiddleware`` fills in the token and sets the cookie.
+
+    **Tag name**::
+
+        bootstrap_csrf_hole
+
+    **Usage**::
+
+        <form method="post">{% bootstrap_csrf_hole %}{% bootstrap_form form %}</form>
+    """
+    return format_html('<input type="hidden" name="csrfmiddlewaretoken" value="{}">', hole_marker(DEFAULT_CSRF_HOLE))
+
+
 @register.simple_tag
 def bootstrap_icon(icon, **kwargs):
     """
@@ -741,7 +887,8 @@ def bootstrap_messages(context, *args, **kwargs):
     we have to set the jquery parameter too when using the
     bootstrap_javascript tag.
 
-    Uses the template ``bootstrap3/messages.html``.
+    Uses the template ``bootstrap3/messages.html``. As long as that template is not overridden, the
+    same HTML is produced in Python.
 
     **Tag name**::
 
@@ -760,12 +907,32 @@ def bootstrap_messages(context, *args, **kwargs):
         {% bootstrap_javascript jquery=1 %}
         {% bootstrap_messages %}
     """
-    # Custom template tags with takes_context=True somehow return Context objects. These
-    # should be forced to dict, using Context.flatten()
+    if not is_template_overridden(MESSAGES_TEMPLATE):
+        if not isinstance(context, Context):
+            context = Context(context)
+        return render_messages(context.get("messages") or [], context)
+    if isinstance(context, Context) and context.template is not None:
+        # Render with a layer on top of the current context, instead of a flattened copy of it
+        with context.push(message_constants=message_constants):
+            return mark_safe(context.template.engine.get_template(MESSAGES_TEMPLATE).render(context))
     if isinstance(context, Context):
         context = context.flatten()
-    context.update({"message_constants": message_constants})
-    return render_template_file("bootstrap3/messages.html", context=context)
+    return render_template_file(MESSAGES_TEMPLATE, context={**context, "message_constants": message_constants})
+
+
+def render_messages(messages, context):
+    """Render messages like the default ``bootstrap3/messages.html`` template, without the template engine."""
+    return mark_safe(
+        "\n"
+        + "".join(
+            MESSAGE_HTML.format(
+                classes=conditional_escape(bootstrap_message_classes(message)),
+                message=render_value_in_context(message, context),
+            )
+            for message in messages
+        )
+        + "\n"
+    )
 
 
 @register.inclusion_tag("bootstrap3/pagination.html")
@@ -813,6 +980,13 @@ def bootstrap_pagination(page, **kwargs):
 
             :default: ``'page'``
 
+        countless
+            Do not use the number of pages. The pages up to the next page are shown, and the last
+            link goes to the next page instead of the last page. Use a paginator from
+            ``bootstrap3.pagination``, such as ``CountlessPaginator``, to avoid counting the objects.
+
+            :default: ``True`` if the paginator has no ``num_pages``, ``False`` otherwise
+
     **Usage**::
 
         {% bootstrap_pagination page %}
@@ -832,51 +1006,36 @@ def bootstrap_url_replace_param(url, name, value):
     return url_replace_param(url, name, value)
 
 
-def get_pagination_context(page, pages_to_show=11, url=None, size=None, extra=None, parameter_name="page"):
+def get_page_param_patterns(parameter_name):
+    """Return the patterns that match the page parameter at the start and in the rest of a query string."""
+    return re.compile(rf"\?{parameter_name}\=[^\&]+"), re.compile(rf"\&{parameter_name}\=[^\&]+")
+
+
+def get_pagination_context(
+    page, pages_to_show=11, url=None, size=None, extra=None, parameter_name="page", countless=None
+):
     """Generate Bootstrap pagination context from a page object."""
     pages_to_show = int(pages_to_show)
     if pages_to_show < 1:
         raise ValueError(f"Pagination pages_to_show should be a positive integer, you specified {pages_to_show}")
-    num_pages = page.paginator.num_pages
     current_page = page.number
-    half_page_num = int(floor(pages_to_show / 2))
-    if half_page_num < 0:
-        half_page_num = 0
-    first_page = current_page - half_page_num
-    if first_page <= 1:
-        first_page = 1
-    if first_page > 1:
-        pages_back = first_page - half_page_num
-        if pages_back < 1:
-            pages_back = 1
+    if countless is None:
+        countless = getattr(page.paginator, "num_pages", None) is None
+    if countless:
+        # Without a count, the next page is the last page that is known to exist
+        has_next = page.has_next()
+        num_pages = current_page + 1 if has_next else current_page
     else:
-        pages_back = None
-    last_page = first_page + pages_to_show - 1
-    if pages_back is None:
-        last_page += 1
-    if last_page > num_pages:
-        last_page = num_pages
-    if last_page < num_pages:
-        pages_forward = last_page + half_page_num
-        if pages_forward > num_pages:
-            pages_forward = num_pages
-    else:
-        pages_forward = None
-        if first_page > 1:
-            first_page -= 1
-        if pages_back is not None and pages_back > 1:
-            pages_back -= 1
-        else:
-            pages_back = None
-    pages_shown = []
-    for i in range(first_page, last_page + 1):
-        pages_shown.append(i)
-        # Append proper character to url
+        num_pages = page.paginator.num_pages
+    first_page, last_page, pages_back, pages_forward = get_page_window(current_page, num_pages, pages_to_show)
+    pages_shown = list(range(first_page, last_page + 1))
+    # Append proper character to url
     if url:
         # Remove existing page GET parameters
         url = force_str(url)
-        url = re.sub(rf"\?{parameter_name}\=[^\&]+", "?", url)
-        url = re.sub(rf"\&{parameter_name}\=[^\&]+", "", url)
+        first_param_re, other_param_re = get_page_param_patterns(parameter_name)
+        url = first_param_re.sub("?", url)
+        url = other_param_re.sub("", url)
         # Append proper separator
         if "?" in url:
             url += "&"
@@ -889,6 +1048,8 @@ def get_pagination_context(page, pages_to_show=11, url=None, size=None, extra=No
         url += force_str(extra) + "&"
     if url:
         url = url.replace("?&", "?")
+    # Build the URLs of all links, parsing the URL only once
+    page_url = url_param_replacer(url or "", parameter_name)
     # Set CSS classes, see http://getbootstrap.com/components/#pagination
     pagination_css_classes = ["pagination"]
     if size == "small":
@@ -898,7 +1059,14 @@ def get_pagination_context(page, pages_to_show=11, url=None, size=None, extra=No
         # Build context object
     return {
         "bootstrap_pagination_url": url,
-        "num_pages": num_pages,
+        "page_links": [(p, page_url(p)) for p in pages_shown],
+        "first_page_url": page_url(1),
+        "last_page_url": None if countless else page_url(num_pages),
+        "next_page_url": page_url(current_page + 1) if countless and has_next else None,
+        "pages_back_url": page_url(pages_back) if pages_back else None,
+        "pages_forward_url": page_url(pages_forward) if pages_forward else None,
+        "num_pages": None if countless else num_pages,
+        "countless": countless,
         "current_page": current_page,
         "first_page": first_page,
         "last_page": last_page,
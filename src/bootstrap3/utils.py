@@ -1,12 +1,18 @@
+import html
+import os
 import re
-from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+import sys
+from functools import lru_cache
+from urllib.parse import parse_qs, quote_plus, urlencode, urlparse, urlunparse
 
-from django.forms.utils import flatatt
-from django.template import Variable, VariableDoesNotExist
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template import TemplateDoesNotExist, Variable, VariableDoesNotExist
 from django.template.base import FilterExpression, TemplateSyntaxError, kwarg_re
 from django.template.loader import get_template
+from django.utils.autoreload import file_changed
 from django.utils.encoding import force_str
-from django.utils.html import format_html
+from django.utils.html import conditional_escape
 from django.utils.safestring import mark_safe
 
 from bootstrap3.exceptions import BootstrapError
@@ -16,6 +22,12 @@ from .text import text_value
 # RegEx for quoted string
 QUOTED_STRING = re.compile(r'^["\'](?P<noquotes>.+)["\']$')
 
+# Directory of the templates that ship with this package
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Whether a template is overridden, keyed by template name
+_overridden_templates = {}
+
 
 def handle_var(value, context):
     """Handle template tag variable."""
@@ -62,27 +74,49 @@ def split_css_classes(css_classes):
     return [c for c in classes_list if c]
 
 
-def add_css_class(css_classes, css_class, prepend=False):
-    """Add a CSS class to a string of CSS classes."""
+# Maximum number of memoized CSS class operations, renderers only use a small set of class strings
+CSS_CLASS_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=CSS_CLASS_CACHE_SIZE)
+def _add_css_class(css_classes, css_class, prepend):
     classes_list = split_css_classes(css_classes)
     classes_to_add = [c for c in split_css_classes(css_class) if c not in classes_list]
     if prepend:
         classes_list = classes_to_add + classes_list
     else:
         classes_list += classes_to_add
-    return " ".join(classes_list)
+    return sys.intern(" ".join(classes_list))
 
 
-def remove_css_class(css_classes, css_class):
-    """Remove a CSS class from a string of CSS classes."""
+@lru_cache(maxsize=CSS_CLASS_CACHE_SIZE)
+def _remove_css_class(css_classes, css_class):
     remove = set(split_css_classes(css_class))
     classes_list = [c for c in split_css_classes(css_classes) if c not in remove]
-    return " ".join(classes_list)
+    return sys.intern(" ".join(classes_list))
+
+
+def add_css_class(css_classes, css_class, prepend=False):
+    """
+    Add a CSS class to a string of CSS classes.
+
+    Results are memoized and interned, since the same classes are added for every field of a form.
+    """
+    return _add_css_class(text_value(css_classes), text_value(css_class), bool(prepend))
+
 
+def remove_css_class(css_classes, css_class):
+    """Remove a CSS class from a string of CSS classes."""
+    return _remove_css_class(text_value(css_classes), text_value(css_class))
 
-def render_script_tag(url):
+
+def render_script_tag(url, defer=False, script_type=None):
     """Build a script tag."""
     url_dict = url_to_attrs_dict(url, url_attr="src")
+    if defer:
+        url_dict["defer"] = True
+    if script_type:
+        url_dict["type"] = script_type
     return render_tag("script", url_dict)
 
 
@@ -96,17 +130,38 @@ def render_link_tag(url, rel="stylesheet", media=None):
     return render_tag("link", attrs=url_dict, close=False)
 
 
+def escape_html(value):
+    """Escape a value for HTML like `conditional_escape()`, with a fast path for plain strings."""
+    if type(value) is str:
+        return html.escape(value)
+    return str(conditional_escape(value))
+
+
 def render_tag(tag, attrs=None, content=None, close=True):
-    """Render a HTML tag."""
-    builder = "<{tag}{attrs}>{content}"
+    """
+    Render a HTML tag.
+
+    The output is the same as `format_html()` with `flatatt()` would give, but every value is escaped
+    once and the tag is built with a single join.
+    """
+    parts = ["<", escape_html(tag)]
+    if attrs:
+        key_value_attrs = []
+        boolean_attrs = []
+        for attr, value in attrs.items():
+            if isinstance(value, bool):
+                if value:
+                    boolean_attrs.append(attr)
+            elif value is not None:
+                key_value_attrs.append((attr, value))
+        for attr, value in sorted(key_value_attrs):
+            parts += (" ", escape_html(attr), '="', escape_html(value), '"')
+        for attr in sorted(boolean_attrs):
+            parts += (" ", escape_html(attr))
+    parts += (">", escape_html(text_value(content)))
     if content or close:
-        builder += "</{tag}>"
-    return format_html(
-        builder,
-        tag=tag,
-        attrs=mark_safe(flatatt(attrs)) if attrs else "",
-        content=text_value(content),
-    )
+        parts += ("</", parts[1], ">")
+    return mark_safe("".join(parts))
 
 
 def render_template_file(template, context=None):
@@ -115,6 +170,37 @@ def render_template_file(template, context=None):
     return template.render(context)
 
 
+def is_template_overridden(template):
+    """Return whether the template loaders find another template than the one that ships with this package."""
+    try:
+        return _overridden_templates[template]
+    except KeyError:
+        try:
+            origin = get_template(template).origin.name
+        except TemplateDoesNotExist:
+            overridden = True
+        else:
+            overridden = os.path.normcase(os.path.normpath(origin)) != os.path.normcase(
+                os.path.normpath(os.path.join(TEMPLATES_DIR, template))
+            )
+        _overridden_templates[template] = overridden
+        return overridden
+
+
+@receiver(setting_changed)
+def reset_overridden_templates_on_setting_changed(*, setting, **kwargs):
+    """Forget which templates are overridden when the template configuration changes."""
+    if setting in ("TEMPLATES", "INSTALLED_APPS"):
+        _overridden_templates.clear()
+
+
+@receiver(file_changed)
+def reset_overridden_templates_on_file_changed(*, file_path, **kwargs):
+    """Forget which templates are overridden when the development server sees a template change."""
+    if file_path.suffix != ".py":
+        _overridden_templates.clear()
+
+
 def url_replace_param(url, name, value):
     """Replace a GET parameter in an URL."""
     url_components = urlparse(force_str(url))
@@ -135,6 +221,35 @@ def url_replace_param(url, name, value):
     )
 
 
+def url_param_replacer(url, name):
+    """
+    Return a function that replaces a GET parameter in an URL, with the same result as `url_replace_param()`.
+
+    The URL is parsed once, and the query string before and after the parameter is encoded once,
+    so building many URLs that only differ in one parameter is cheap.
+    """
+    url_components = urlparse(force_str(url))
+    query_params = parse_qs(url_components.query)
+    query_params.setdefault(name, None)
+    names = list(query_params)
+    index = names.index(name)
+    before = urlencode({key: query_params[key] for key in names[:index]}, doseq=True)
+    after = urlencode({key: query_params[key] for key in names[index + 1 :]}, doseq=True)
+    base = urlunparse(
+        [url_components.scheme, url_components.netloc, url_components.path, url_components.params, "", ""]
+    )
+    prefix = f"{base}?{before}&" if before else f"{base}?"
+    suffix = f"&{after}" if after else ""
+    if url_components.fragment:
+        suffix += f"#{url_components.fragment}"
+    encoded_name = quote_plus(name)
+
+    def replace_param(value):
+        return f"{prefix}{encoded_name}={quote_plus(str(value))}{suffix}"
+
+    return replace_param
+
+
 def url_to_attrs_dict(url, url_attr):
     """Sanitize url dict as used in django-bootstrap3 settings."""
     result = dict()
@@ -0,0 +1,184 @@
+from django.contrib.admin.widgets import AdminFileWidget
+from django.dispatch import Signal
+from django.forms import (
+    CheckboxInput,
+    CheckboxSelectMultiple,
+    ClearableFileInput,
+    DateInput,
+    DateTimeInput,
+    EmailInput,
+    FileInput,
+    HiddenInput,
+    MultipleHiddenInput,
+    MultiWidget,
+    NullBooleanSelect,
+    NumberInput,
+    PasswordInput,
+    RadioSelect,
+    Select,
+    SelectDateWidget,
+    SelectMultiple,
+    SplitDateTimeWidget,
+    SplitHiddenDateTimeWidget,
+    Textarea,
+    TextInput,
+    TimeInput,
+    URLInput,
+)
+from django.forms.widgets import ColorInput, Input, SearchInput, TelInput
+
+from .exceptions import BootstrapError
+
+try:
+    # If Django is set up without a database, importing this widget gives RuntimeError
+    from django.contrib.auth.forms import ReadOnlyPasswordHashWidget
+except RuntimeError:
+    ReadOnlyPasswordHashWidget = None
+
+# These widgets will not be wrapped in a form-control class
+WIDGETS_NO_FORM_CONTROL = (CheckboxInput, RadioSelect, CheckboxSelectMultiple, FileInput)
+
+# These widgets can be wrapped in an input group with addons
+WIDGETS_INPUT_GROUP = (TextInput, NumberInput, EmailInput, URLInput, DateInput, Select, PasswordInput)
+
+# These widgets get a placeholder
+WIDGETS_WITH_PLACEHOLDER = (TextInput, Textarea, NumberInput, EmailInput, URLInput, PasswordInput)
+
+# These widgets do not get the required attribute
+WIDGETS_NO_REQUIRED = (AdminFileWidget, HiddenInput, FileInput, CheckboxInput, CheckboxSelectMultiple)
+
+# Widgets that render their value as text, so a hole marker can take the place of the value
+WIDGETS_WITH_HOLE = (Input, Textarea)
+WIDGETS_WITHOUT_HOLE = (CheckboxInput, FileInput, PasswordInput)
+
+# Widgets that use their id and name only in the id, name, for and aria-describedby attributes,
+# so the HTML of the empty form of a formset can be stamped with the prefix of an extra form
+WIDGETS_STAMPABLE = (
+    TextInput,
+    NumberInput,
+    EmailInput,
+    URLInput,
+    ColorInput,
+    SearchInput,
+    TelInput,
+    PasswordInput,
+    HiddenInput,
+    MultipleHiddenInput,
+    FileInput,
+    ClearableFileInput,
+    Textarea,
+    DateInput,
+    DateTimeInput,
+    TimeInput,
+    CheckboxInput,
+    Select,
+    NullBooleanSelect,
+    SelectMultiple,
+    RadioSelect,
+    CheckboxSelectMultiple,
+    MultiWidget,
+    SplitDateTimeWidget,
+    SplitHiddenDateTimeWidget,
+    SelectDateWidget,
+)
+
+# Behaviour of widgets that no registered class decides on
+DEFAULT_WIDGET_BEHAVIOUR = {
+    # Class added to the widget
+    "form_control_class": "form-control",
+    # Whether the size class (input-sm, input-lg) is added to the widget
+    "add_size_class": True,
+    "is_multi_widget": False,
+    "is_checkbox": False,
+    "has_placeholder": False,
+    # Whether the widget can be wrapped in an input group with addons
+    "has_input_group": False,
+    # Whether a hole marker can take the place of the value
+    "has_hole": False,
+    # Whether the widget gets the required attribute when its field is required
+    "has_required_attribute": True,
+    # Whether the widget uses its id and name only in the id, name, for and aria-describedby attributes.
+    # This is not inherited, a subclass may use them elsewhere, e.g. in a script.
+    "stampable": False,
+    # Name and extra arguments of a method of the field renderer that changes the rendered widget, or a
+    # function that takes the field renderer and the HTML and returns the new HTML
+    "post_render": None,
+}
+
+# Registered behaviour, keyed by widget class
+_widget_behaviours = {}
+
+# Resolved behaviour, keyed by widget class
+_resolved_behaviours = {}
+
+# Sent when the resolved behaviour is cleared, receivers clear what they built from it
+widget_behaviour_changed = Signal()
+
+
+def register_widget(widget_cls, **behaviour):
+    """
+    Register how django-bootstrap3 renders a widget class and its subclasses.
+
+    The keyword arguments are keys of `DEFAULT_WIDGET_BEHAVIOUR`. Keys that are not given are taken from the
+    closest base class in the method resolution order that has them, or from `DEFAULT_WIDGET_BEHAVIOUR`.
+    Only ``stampable`` is not inherited, it is taken from the registered class itself.
+    Register widgets before rendering, e.g. in the ``ready()`` method of an app config::
+
+        register_widget(DatePickerInput, has_placeholder=True, has_input_group=True)
+    """
+    unknown = set(behaviour) - set(DEFAULT_WIDGET_BEHAVIOUR)
+    if unknown:
+        raise BootstrapError(f"Unknown widget behaviour: {', '.join(sorted(unknown))}.")
+    _widget_behaviours.setdefault(widget_cls, {}).update(behaviour)
+    # Classes that were resolved before may inherit from the registered class
+    clear_widget_caches()
+
+
+def clear_widget_caches():
+    """Clear the resolved behaviour, and send `widget_behaviour_changed` to clear what was built from it."""
+    _resolved_behaviours.clear()
+    widget_behaviour_changed.send(sender=None)
+
+
+def get_widget_behaviour(widget_cls):
+    """Return the behaviour of a widget class as a dict, resolved once per class."""
+    try:
+        return _resolved_behaviours[widget_cls]
+    except KeyError:
+        pass
+    behaviour = {}
+    for cls in widget_cls.__mro__:
+        registered = _widget_behaviours.get(cls)
+        if registered:
+            for key, value in registered.items():
+                behaviour.setdefault(key, value)
+    behaviour["stampable"] = _widget_behaviours.get(widget_cls, {}).get("stampable", False)
+    for key, value in DEFAULT_WIDGET_BEHAVIOUR.items():
+        behaviour.setdefault(key, value)
+    _resolved_behaviours[widget_cls] = behaviour
+    return behaviour
+
+
+for widget_cls in WIDGETS_NO_FORM_CONTROL:
+    register_widget(widget_cls, form_control_class="", add_size_class=False)
+if ReadOnlyPasswordHashWidget is not None:
+    # Render this is a static control
+    register_widget(ReadOnlyPasswordHashWidget, form_control_class="form-control-static", add_size_class=False)
+for widget_cls in WIDGETS_INPUT_GROUP:
+    register_widget(widget_cls, has_input_group=True)
+for widget_cls in WIDGETS_WITH_PLACEHOLDER:
+    register_widget(widget_cls, has_placeholder=True)
+for widget_cls in WIDGETS_NO_REQUIRED:
+    register_widget(widget_cls, has_required_attribute=False)
+for widget_cls in WIDGETS_WITH_HOLE:
+    register_widget(widget_cls, has_hole=True)
+for widget_cls in WIDGETS_WITHOUT_HOLE:
+    register_widget(widget_cls, has_hole=False)
+for widget_cls in WIDGETS_STAMPABLE:
+    register_widget(widget_cls, stampable=True)
+register_widget(MultiWidget, is_multi_widget=True)
+register_widget(CheckboxInput, is_checkbox=True, post_render=("put_inside_label",))
+register_widget(CheckboxSelectMultiple, post_render=("list_to_class", "checkbox"))
+register_widget(RadioSelect, post_render=("list_to_class", "radio"))
+register_widget(SelectDateWidget, post_render=("fix_date_select_input",))
+register_widget(ClearableFileInput, post_render=("fix_clearable_file_input",))
@@ -0,0 +1,32 @@
+"""
+Micro-benchmarks, run with ``just bench`` or ``python -m tests.benchmarks [name ...]``.
+
+Benchmark modules are named ``bench_*.py`` so the test runner does not collect them. Each module
+has a ``run()`` function that prints its timings.
+"""
+
+import os
+import timeit
+
+
+def setup():
+    """Set up Django with the test settings."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.app.settings")
+    import django
+
+    django.setup()
+
+
+def measure(label, func, number=1000, repeat=5):
+    """Print and return the best time per call of `func` in microseconds."""
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+    print(f"  {label:<50} {best:12.2f} us")
+    return best
+
+
+def compare(label, before, after, number=1000, repeat=5):
+    """Print the timings of `before` and `after`, and the speedup."""
+    print(label)
+    before_time = measure("before", before, number=number, repeat=repeat)
+    after_time = measure("after", after, number=number, repeat=repeat)
+    print(f"  {'speedup':<50} {before_time / after_time:12.2f} x")
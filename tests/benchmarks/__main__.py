@@ -0,0 +1,18 @@
+import sys
+from importlib import import_module
+from pathlib import Path
+
+from . import setup
+
+
+def main(names):
+    setup()
+    if not names:
+        names = sorted(path.stem[len("bench_") :] for path in Path(__file__).parent.glob("bench_*.py"))
+    for name in names:
+        print(f"== {name} ==")
+        import_module(f"{__package__}.bench_{name}").run()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,38 @@
+from django.template import Context, engines
+
+from bootstrap3.bootstrap import css_url, get_bootstrap_setting, javascript_url, jquery_url, theme_url
+from bootstrap3.components import render_css, render_javascript
+from bootstrap3.utils import render_link_tag, render_script_tag
+
+from . import compare, measure
+
+
+def legacy_bootstrap_css():
+    rendered_urls = [render_link_tag(css_url())]
+    if theme_url():
+        rendered_urls.append(render_link_tag(theme_url()))
+    return "".join(rendered_urls)
+
+
+def legacy_bootstrap_javascript(jquery=None):
+    javascript = ""
+    if jquery is None:
+        jquery = get_bootstrap_setting("include_jquery", False)
+    if jquery:
+        url = jquery_url()
+        if url:
+            javascript += render_script_tag(url)
+    url = javascript_url()
+    if url:
+        javascript += render_script_tag(url)
+    return javascript
+
+
+def run():
+    compare(
+        "bootstrap_css and bootstrap_javascript",
+        lambda: legacy_bootstrap_css() + legacy_bootstrap_javascript(jquery=True),
+        lambda: render_css() + render_javascript(jquery=True),
+    )
+    base = engines["django"].engine.get_template("bootstrap3/bootstrap3.html")
+    measure("bootstrap3.html", lambda: base.render(Context()))
@@ -0,0 +1,56 @@
+from bootstrap3.renderers import FieldRenderer
+from bootstrap3.text import text_value
+from bootstrap3.utils import add_css_class, remove_css_class
+from tests.app.forms import TestForm
+
+from . import compare, measure
+
+
+def split_css_classes(css_classes):
+    classes_list = text_value(css_classes).split(" ")
+    return [c for c in classes_list if c]
+
+
+def legacy_add_css_class(css_classes, css_class, prepend=False):
+    classes_list = split_css_classes(css_classes)
+    classes_to_add = [c for c in split_css_classes(css_class) if c not in classes_list]
+    if prepend:
+        classes_list = classes_to_add + classes_list
+    else:
+        classes_list += classes_to_add
+    return " ".join(classes_list)
+
+
+def legacy_remove_css_class(css_classes, css_class):
+    remove = set(split_css_classes(css_class))
+    classes_list = [c for c in split_css_classes(css_classes) if c not in remove]
+    return " ".join(classes_list)
+
+
+def field_calls(add, remove):
+    """Do the class operations of `FieldRenderer` for a horizontal field with errors."""
+    classes = add("", "form-control", prepend=True)
+    classes = add(classes, "input-sm")
+    add("", "control-label")
+    add("control-label", "col-md-3")
+    form_group = add("form-group", "bootstrap3-req")
+    form_group = add(form_group, "has-error")
+    remove(form_group, "has-error")
+    return classes
+
+
+def run():
+    for fields in (20, 200):
+        compare(
+            f"class operations for {fields} fields",
+            lambda: [field_calls(legacy_add_css_class, legacy_remove_css_class) for _ in range(fields)],
+            lambda: [field_calls(add_css_class, remove_css_class) for _ in range(fields)],
+            number=100,
+        )
+    form = TestForm()
+    fields = list(form)
+    measure(
+        f"FieldRenderer for the {len(fields)} fields of TestForm",
+        lambda: [FieldRenderer(f).render() for f in fields],
+        number=20,
+    )
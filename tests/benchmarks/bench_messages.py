@@ -0,0 +1,33 @@
+from django.contrib.messages import constants as message_constants
+from django.contrib.messages.storage.base import Message
+from django.template import Context, engines
+
+from bootstrap3.utils import render_template_file
+
+from . import compare, measure
+
+
+def legacy_bootstrap_messages(context):
+    context = context.flatten()
+    context.update({"message_constants": message_constants})
+    return render_template_file("bootstrap3/messages.html", context=context)
+
+
+def layered_bootstrap_messages(context):
+    with context.push(message_constants=message_constants):
+        return context.template.engine.get_template("bootstrap3/messages.html").render(context)
+
+
+def run():
+    template = engines["django"].from_string("{% load bootstrap3 %}{% bootstrap_messages %}")
+    bootstrap_messages = template.template.nodelist[-1]
+    messages = [Message(message_constants.INFO, "Saved."), Message(message_constants.ERROR, "Not saved.")]
+    context = Context({f"variable_{i}": list(range(10)) for i in range(500)})
+    context.update({"messages": messages})
+    with context.bind_template(template.template):
+        compare(
+            "bootstrap_messages with 500 context variables",
+            lambda: legacy_bootstrap_messages(context),
+            lambda: bootstrap_messages.render(context),
+        )
+        measure("template on a context layer, for overridden templates", lambda: layered_bootstrap_messages(context))
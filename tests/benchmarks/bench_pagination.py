@@ -0,0 +1,31 @@
+from django.core.paginator import Paginator
+from django.template.loader import get_template
+
+from bootstrap3.pagination import get_page_window
+from bootstrap3.templatetags.bootstrap3 import get_pagination_context
+from bootstrap3.utils import url_param_replacer, url_replace_param
+
+from . import compare, measure
+
+
+def run():
+    url = "/list?q=django&sort=name&page=7"
+    pages = list(range(1, 12))
+    compare(
+        "URLs for 11 page links",
+        lambda: [url_replace_param(url, "page", p) for p in pages],
+        lambda: list(map(url_param_replacer(url, "page"), pages)),
+    )
+    for num_pages in (10, 10**3, 10**6, 10**9):
+        measure(
+            f"page window for page {num_pages // 2} of {num_pages}", lambda: get_page_window(num_pages // 2, num_pages)
+        )
+    for num_pages in (10, 10**3, 10**6, 10**9):
+        page = Paginator(range(num_pages), 1).page(num_pages // 2)
+        measure(f"pagination context for {num_pages} pages", lambda: get_pagination_context(page, url=url))
+    page = Paginator(range(1000), 10).page(50)
+    template = get_template("bootstrap3/pagination.html")
+    measure(
+        "bootstrap_pagination with 11 pages shown",
+        lambda: template.render(get_pagination_context(page, url=url)),
+    )
@@ -0,0 +1,31 @@
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from bootstrap3.text import text_value
+from bootstrap3.utils import render_tag
+
+from . import compare
+
+
+def legacy_render_tag(tag, attrs=None, content=None, close=True):
+    builder = "<{tag}{attrs}>{content}"
+    if content or close:
+        builder += "</{tag}>"
+    return format_html(
+        builder,
+        tag=tag,
+        attrs=mark_safe(flatatt(attrs)) if attrs else "",
+        content=text_value(content),
+    )
+
+
+def run():
+    attrs = {"class": "control-label col-md-3", "for": "id_subject"}
+    for fields in (20, 200):
+        compare(
+            f"labels for {fields} fields",
+            lambda: [legacy_render_tag("label", attrs=attrs, content="Subject") for _ in range(fields)],
+            lambda: [render_tag("label", attrs=attrs, content="Subject") for _ in range(fields)],
+            number=100,
+        )
@@ -0,0 +1,39 @@
+import tracemalloc
+
+from bootstrap3.renderers import FieldRenderer, FormRenderer
+
+from . import measure
+
+
+class InstanceDictFieldRenderer(FieldRenderer):
+    """Keeps its state in an instance dict, like the renderers did before they had slots."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                self.__dict__[name] = getattr(self, name)
+
+
+def allocated_bytes(func, number=1000):
+    func()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = [func() for _ in range(number)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del results
+    return allocated / number
+
+
+def run():
+    from tests.app.forms import TestForm
+
+    form = TestForm()
+    field = form["subject"]
+    measure("FieldRenderer(field)", lambda: FieldRenderer(field))
+    print(
+        f"  {'bytes per renderer, instance dict':<50} {allocated_bytes(lambda: InstanceDictFieldRenderer(field)):12.0f}"
+    )
+    print(f"  {'bytes per renderer, slots':<50} {allocated_bytes(lambda: FieldRenderer(field)):12.0f}")
+    measure("FormRenderer(form).render()", lambda: FormRenderer(form).render(), number=100)
@@ -0,0 +1,127 @@
+import functools
+from unittest import mock
+
+from django import forms
+from django.contrib.auth.models import Group
+from django.forms import formset_factory
+from django.test import TestCase, override_settings
+from django.utils import translation
+
+from bootstrap3 import cache
+from bootstrap3.cache import LRUCache, clear_form_cache, get_form_cache, get_form_cache_key
+from bootstrap3.forms import render_form, render_formset
+from bootstrap3.renderers import FormRenderer
+from tests.app.forms import SmallTestForm, TestForm, render_template_with_form
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "forms": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "forms"},
+}
+
+
+class GroupForm(forms.Form):
+    group = forms.ModelChoiceField(queryset=Group.objects.all())
+
+
+class LRUCacheTest(TestCase):
+    def test_discards_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+
+class FormCacheTest(TestCase):
+    def setUp(self):
+        clear_form_cache()
+
+    def assertRenderCount(self, count, func):
+        with mock.patch.object(FormRenderer, "render", autospec=True, side_effect=FormRenderer.render) as render:
+            result = func()
+        self.assertEqual(render.call_count, count)
+        return result
+
+    def test_not_cached_by_default(self):
+        render_form(TestForm())
+        self.assertRenderCount(1, lambda: render_form(TestForm()))
+
+    def test_cache_kwarg(self):
+        html = str(render_form(TestForm()))
+        self.assertEqual(self.assertRenderCount(1, lambda: render_form(TestForm(), cache=True)), html)
+        self.assertEqual(self.assertRenderCount(0, lambda: render_form(TestForm(), cache=True)), html)
+        self.assertRenderCount(1, lambda: render_form(TestForm(), cache=True, layout="horizontal"))
+        self.assertRenderCount(1, lambda: render_form(TestForm(prefix="other"), cache=True))
+
+    def test_cache_tag(self):
+        template = "{% bootstrap_form form cache=True %}"
+        html = self.assertRenderCount(1, lambda: render_template_with_form(template))
+        self.assertEqual(self.assertRenderCount(0, lambda: render_template_with_form(template)), html)
+
+    @override_settings(BOOTSTRAP3={"form_cache": True})
+    def test_cache_setting(self):
+        render_form(SmallTestForm())
+        self.assertRenderCount(0, lambda: render_form(SmallTestForm()))
+        self.assertRenderCount(1, lambda: render_form(SmallTestForm(), cache=False))
+
+    def test_not_cached(self):
+        self.assertIsNone(get_form_cache_key(FormRenderer, SmallTestForm({})))
+        self.assertIsNone(get_form_cache_key(FormRenderer, SmallTestForm(initial={"subject": "user"})))
+        self.assertIsNone(get_form_cache_key(FormRenderer, GroupForm()))
+        form = SmallTestForm()
+        form.fields["subject"].initial = lambda: "user"
+        self.assertIsNone(get_form_cache_key(FormRenderer, form))
+        # Initial values set on the fields of an instance are often per user
+        form = SmallTestForm()
+        form.fields["subject"].initial = "user@example.com"
+        self.assertIsNone(get_form_cache_key(FormRenderer, form))
+        form = SmallTestForm()
+        form.fields["extra"] = forms.CharField(initial="user")
+        self.assertIsNone(get_form_cache_key(FormRenderer, form))
+        form.fields["extra"].initial = None
+        self.assertIsNotNone(get_form_cache_key(FormRenderer, form))
+        # Hole markers are signed per page
+        self.assertIsNone(get_form_cache_key(FormRenderer, SmallTestForm(), holes="subject=subject"))
+
+    @override_settings(BOOTSTRAP3={"form_cache": True})
+    def test_formset_not_cached(self):
+        render_formset(formset_factory(SmallTestForm, extra=3)())
+        self.assertEqual(len(get_form_cache()), 0)
+
+    def test_changed_fields(self):
+        form = SmallTestForm()
+        form.fields["subject"].label = "Changed"
+        self.assertNotEqual(get_form_cache_key(FormRenderer, form), get_form_cache_key(FormRenderer, SmallTestForm()))
+
+    def test_language(self):
+        key = get_form_cache_key(FormRenderer, SmallTestForm())
+        with translation.override("nl"):
+            self.assertNotEqual(get_form_cache_key(FormRenderer, SmallTestForm()), key)
+
+    def test_settings_change(self):
+        key = get_form_cache_key(FormRenderer, SmallTestForm())
+        with self.settings(BOOTSTRAP3={"horizontal_label_class": "col-md-2"}):
+            self.assertNotEqual(get_form_cache_key(FormRenderer, SmallTestForm()), key)
+        self.assertEqual(get_form_cache_key(FormRenderer, SmallTestForm()), key)
+        with self.settings(STATIC_URL="/assets/"):
+            self.assertIsNone(cache._settings_digest)
+
+    def test_callable_settings(self):
+        key = get_form_cache_key(FormRenderer, SmallTestForm())
+        with self.settings(BOOTSTRAP3={"holes": {"email": translation.get_language}}):
+            callable_key = get_form_cache_key(FormRenderer, SmallTestForm())
+            self.assertIsNotNone(callable_key)
+            self.assertNotEqual(callable_key, key)
+            self.assertEqual(get_form_cache_key(FormRenderer, SmallTestForm()), callable_key)
+        with self.settings(BOOTSTRAP3={"holes": {"email": functools.partial(translation.get_language)}}):
+            self.assertIsNotNone(get_form_cache_key(FormRenderer, SmallTestForm()))
+
+    @override_settings(CACHES=LOCMEM_CACHES, BOOTSTRAP3={"form_cache": True, "form_cache_alias": "forms"})
+    def test_cache_alias(self):
+        html = render_form(SmallTestForm())
+        self.assertEqual(get_form_cache().get(get_form_cache_key(FormRenderer, SmallTestForm())), html)
+        self.assertEqual(self.assertRenderCount(0, lambda: render_form(SmallTestForm())), html)
@@ -0,0 +1,182 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.core.signals import setting_changed
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+
+from bootstrap3.components import get_critical_css
+from bootstrap3.css import extract_critical_css, parse_stylesheet, selector_matches
+
+FIXTURE_CSS = os.path.join(os.path.dirname(__file__), "fixtures", "bootstrap-excerpt.css")
+BOOTSTRAP_CSS = os.path.join(os.path.dirname(__file__), "fixtures", "bootstrap-3.4.1.min.css")
+
+PAGE_TEMPLATE = """{% extends "bootstrap3/bootstrap3.html" %}{% load bootstrap3 %}
+{% block bootstrap3_content %}
+<div class="navbar container"><a class="btn btn-primary" href="#">{% bootstrap_icon "star" %}</a></div>
+<!-- bootstrap3:fold -->
+<div class="progress-bar active" id="footer"><p class="text-muted">Footer</p></div>
+{% endblock %}
+"""
+
+
+def read_fixture_css():
+    with open(FIXTURE_CSS, encoding="utf-8") as f:
+        return f.read()
+
+
+class CssParserTest(TestCase):
+    def test_parse_stylesheet(self):
+        rules = parse_stylesheet(
+            '@charset "UTF-8";/* a { } */a , b:hover{ color : red; content: "}{ /*" }'
+            "@media (min-width: 768px){.x{width:1px}}}"
+        )
+        self.assertEqual(
+            rules,
+            [
+                ('@charset "UTF-8"', None),
+                ("a , b:hover", 'color:red;content:"}{ /*"'),
+                ("@media (min-width: 768px)", [(".x", "width:1px")]),
+            ],
+        )
+
+    def test_selector_matches(self):
+        document = type("Document", (), {"elements": {"html", "body", "a"}, "classes": {"btn"}, "ids": {"main"}})
+        document.attributes = {"href"}
+        for selector in ["a", ".btn", "a.btn:hover", "#main > .btn", "a[href]", "*:before", ".btn:not(.active)"]:
+            self.assertTrue(selector_matches(selector, document), selector)
+        for selector in ["p", ".btn-primary", "a .active", "#footer", "input[type=checkbox]", ".btn + p"]:
+            self.assertFalse(selector_matches(selector, document), selector)
+
+    def test_extract_critical_css(self):
+        html = render_to_string("bootstrap3/bootstrap3.html", {})
+        self.assertEqual(extract_critical_css("html{margin:0}.btn{display:block}", html), "html{margin:0}")
+
+    def test_extract_from_bootstrap(self):
+        html = '<div class="navbar container"><a class="btn" href="#"><span class="glyphicon glyphicon-star">'
+        html += '</span></a></div><!-- bootstrap3:fold --><div class="progress-bar active"></div>'
+        css = extract_critical_css(read_fixture_css(), html, base_url="https://cdn.example.com/bootstrap/css/x.css")
+        self.assertIn("html{font-family:sans-serif;-webkit-text-size-adjust:100%;}", css)
+        self.assertIn(".btn{display:inline-block;padding:6px 12px;}", css)
+        self.assertIn("@media (min-width: 768px){.container{width:750px;}.navbar{border-radius:4px;}}", css)
+        self.assertIn('src:url("https://cdn.example.com/bootstrap/fonts/glyphicons-halflings-regular.eot")', css)
+        self.assertIn(".glyphicon-star:before", css)
+        for left_out in (".btn-primary", ".glyphicon-heart", "@media print", "table-responsive", "progress-bar", "/*"):
+            self.assertNotIn(left_out, css)
+        # Below the fold is used without a marker
+        self.assertIn("@keyframes progress-bar-stripes", extract_critical_css(read_fixture_css(), html, None))
+
+
+class BootstrapCssTest(TestCase):
+    def test_extract_from_bootstrap_min_css(self):
+        with open(BOOTSTRAP_CSS, encoding="utf-8") as f:
+            bootstrap_css = f.read()
+        html = render_to_string("bootstrap3/bootstrap3.html", {})
+        html += '<nav class="navbar navbar-default"><div class="container"><a class="btn btn-primary" href="#">'
+        html += '<span class="glyphicon glyphicon-star"></span></a></div></nav><!-- bootstrap3:fold -->'
+        html += '<table class="table table-striped"><tr><td>Below</td></tr></table>'
+        css = extract_critical_css(bootstrap_css, html, base_url="https://cdn.example.com/bootstrap/css/x.css")
+        self.assertLess(len(css), len(bootstrap_css) // 4)
+        for kept in (
+            "html{font-family:sans-serif;",
+            ".btn-primary{color:#fff;",
+            ".navbar-default{background-color:#f8f8f8;",
+            "@media (min-width:768px){",
+            ".container{",
+            ".glyphicon-star:before{",
+            'src:url("https://cdn.example.com/bootstrap/fonts/glyphicons-halflings-regular.eot")',
+        ):
+            self.assertIn(kept, css)
+        for left_out in (".table-striped", ".progress-bar", ".carousel", ".glyphicon-heart:before", "sourceMappingURL"):
+            self.assertNotIn(left_out, css)
+        self.assertEqual(parse_stylesheet(css)[0][0], "html")
+
+
+class CriticalCssTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        with open(os.path.join(tmp.name, "page.html"), "w", encoding="utf-8") as f:
+            f.write(PAGE_TEMPLATE)
+        self.output = os.path.join(tmp.name, "critical.json")
+        templates = override_settings(
+            TEMPLATES=[
+                {"BACKEND": "django.template.backends.django.DjangoTemplates", "DIRS": [tmp.name], "APP_DIRS": True}
+            ]
+        )
+        templates.enable()
+        self.addCleanup(templates.disable)
+
+    def extract(self, *args):
+        call_command("bootstrap3_critical_css", "page.html", "--css", FIXTURE_CSS, *args, stdout=StringIO())
+
+    def test_command(self):
+        self.extract("--output", self.output)
+        with open(self.output, encoding="utf-8") as f:
+            css = json.load(f)["templates"]["page.html"]
+        self.assertIn(".btn-primary{", css)
+        self.assertNotIn("#footer", css)
+        self.assertIn('url("https://stackpath.bootstrapcdn.com/bootstrap/3.4.1/fonts/glyphicons', css)
+
+    def test_command_with_bootstrap_min_css(self):
+        with override_settings(BOOTSTRAP3={"critical_css": self.output}):
+            with open(self.output, "w", encoding="utf-8") as f:
+                json.dump({"templates": {"page.html": "old"}}, f)
+            changed_settings = []
+
+            def receiver(setting, **kwargs):
+                changed_settings.append(setting)
+
+            setting_changed.connect(receiver)
+            try:
+                call_command("bootstrap3_critical_css", "page.html", "--css", BOOTSTRAP_CSS, stdout=StringIO())
+            finally:
+                setting_changed.disconnect(receiver)
+            self.assertEqual(changed_settings, [])
+            with open(self.output, encoding="utf-8") as f:
+                css = json.load(f)["templates"]["page.html"]
+            self.assertIn(".btn-primary{", css)
+            self.assertNotIn(".progress-bar", css)
+            # The page was rendered without reading the old critical CSS
+            self.assertEqual(get_critical_css("page.html"), css)
+
+    def test_rendering(self):
+        with override_settings(BOOTSTRAP3={"critical_css": self.output}):
+            self.extract()
+            html = render_to_string("page.html")
+        self.assertIn("<style>html{", html)
+        self.assertIn(
+            '<link as="style" crossorigin="anonymous" href="https://stackpath.bootstrapcdn.com/bootstrap/3.4.1/css/'
+            'bootstrap.min.css" integrity="sha384-HSMxcRTRxnN+Bdg0JdbxYKrThecOKuH5zCYotlSAcp1+c8xmyTe9GYg1l9a69psu" '
+            'onload="this.onload=null;this.rel=\'stylesheet\'" rel="preload">',
+            html.replace("&#x27;", "'"),
+        )
+        self.assertIn('<noscript><link crossorigin="anonymous" href="https://stackpath', html)
+        # Templates without critical CSS render the stylesheet as usual
+        self.assertNotIn("<style>", render_to_string("bootstrap3/bootstrap3.html"))
+
+    def test_style_cannot_be_closed(self):
+        with open(self.output, "w", encoding="utf-8") as f:
+            json.dump({"templates": {"page.html": 'a{content:"</style><script>"}'}}, f)
+        with override_settings(BOOTSTRAP3={"critical_css": self.output}):
+            self.assertIn('<style>a{content:"<\\/style><script>"}</style>', render_to_string("page.html"))
+
+    def test_errors(self):
+        with self.assertRaises(CommandError):
+            self.extract()
+        with self.assertRaises(CommandError):
+            call_command("bootstrap3_critical_css", "missing.html", "--css", FIXTURE_CSS, "--output", self.output)
+        with override_settings(BOOTSTRAP3={"critical_css": self.output}):
+            with self.assertWarns(RuntimeWarning):
+                html = render_to_string("page.html")
+            self.assertIn('href="https://stackpath.bootstrapcdn.com/bootstrap/3.4.1/css/bootstrap.min.css"', html)
+            self.assertNotIn("preload", html)
+            self.assertNotIn("<style>", html)
+            # The failure is remembered, the file is not read for every page
+            with mock.patch("bootstrap3.components.load_critical_css") as load:
+                render_to_string("page.html")
+            load.assert_not_called()
@@ -0,0 +1,146 @@
+from django import forms
+from django.http import HttpResponse
+from django.template import engines
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import path
+
+from bootstrap3.exceptions import BootstrapError
+from bootstrap3.holes import fill_holes, hole_marker, parse_holes, reset_hole_scope, set_hole_scope
+from bootstrap3.renderers import FieldRenderer, FormRenderer
+
+TEMPLATE = """{% load bootstrap3 %}<p>{% bootstrap_hole "name" %}</p>
+<form method="post">{% bootstrap_csrf_hole %}{% bootstrap_form form holes="email=email" %}</form>"""
+
+view_calls = []
+
+
+class NewsletterForm(forms.Form):
+    email = forms.EmailField()
+    subscribe = forms.BooleanField(required=False)
+
+
+def name(request):
+    return request.COOKIES.get("name", "anonymous")
+
+
+def email(request):
+    return request.COOKIES.get("name", "anonymous") + "@example.com"
+
+
+def form_view(request):
+    view_calls.append(request)
+    if request.method == "POST":
+        return HttpResponse("posted")
+    return HttpResponse(engines["django"].from_string(TEMPLATE).render({"form": NewsletterForm()}))
+
+
+def comment_view(request):
+    # User content that tries to read the CSRF token of the viewer
+    comment = request.GET.get("comment", "")
+    return HttpResponse(engines["django"].from_string(COMMENT_TEMPLATE).render({"comment": comment}))
+
+
+COMMENT_TEMPLATE = """{% load bootstrap3 %}<a href="{{ comment }}">{{ comment }}</a>{% bootstrap_csrf_hole %}"""
+
+urlpatterns = [path("form/", form_view), path("comment/", comment_view)]
+
+
+@override_settings(
+    ROOT_URLCONF="tests.test_holes",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "holes"}},
+    CACHE_MIDDLEWARE_SECONDS=60,
+    MIDDLEWARE=[
+        "bootstrap3.middleware.HoleMiddleware",
+        "django.middleware.cache.UpdateCacheMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.middleware.cache.FetchFromCacheMiddleware",
+    ],
+    BOOTSTRAP3={"holes": {"name": "tests.test_holes.name", "email": "tests.test_holes.email"}},
+)
+class HoleMiddlewareTest(TestCase):
+    def setUp(self):
+        view_calls.clear()
+
+    def get_token(self, content):
+        return content.split('name="csrfmiddlewaretoken" value="', 1)[1].split('"', 1)[0]
+
+    def test_cached_page_with_holes(self):
+        alice = Client(enforce_csrf_checks=True)
+        alice.cookies["name"] = "alice"
+        bob = Client(enforce_csrf_checks=True)
+        bob.cookies["name"] = "<bob>"
+
+        alice_page = alice.get("/form/").content.decode()
+        bob_page = bob.get("/form/").content.decode()
+
+        self.assertEqual(len(view_calls), 1)
+        self.assertNotIn("bootstrap3-hole", alice_page + bob_page)
+        self.assertIn("<p>alice</p>", alice_page)
+        self.assertIn("<p>&lt;bob&gt;</p>", bob_page)
+        self.assertIn('value="alice@example.com"', alice_page)
+        self.assertIn('value="&lt;bob&gt;@example.com"', bob_page)
+
+        alice_token = self.get_token(alice_page)
+        bob_token = self.get_token(bob_page)
+        self.assertNotEqual(alice.cookies["csrftoken"].value, bob.cookies["csrftoken"].value)
+        self.assertEqual(alice.post("/form/", {"csrfmiddlewaretoken": alice_token}).status_code, 200)
+        self.assertEqual(bob.post("/form/", {"csrfmiddlewaretoken": bob_token}).status_code, 200)
+        self.assertEqual(alice.post("/form/", {}).status_code, 403)
+
+    def test_forged_markers(self):
+        request = RequestFactory().get("/form/")
+        token = set_hole_scope(request)
+        try:
+            name_marker = hole_marker("name")
+        finally:
+            reset_hole_scope(token)
+        forged = "[[bootstrap3-hole:csrf_token]][[bootstrap3-hole:csrf_token:0123abcd]]"
+        self.assertEqual(fill_holes(forged + name_marker, request), forged + "anonymous")
+        # A marker that was rendered for another page is not filled
+        self.assertEqual(fill_holes(name_marker, RequestFactory().get("/comment/")), name_marker)
+
+    def test_forged_markers_in_content(self):
+        forged = "[[bootstrap3-hole:csrf_token]]"
+        page = self.client.get("/comment/", {"comment": forged}).content.decode()
+        self.assertEqual(page.count(forged), 2)
+        self.assertNotIn(self.client.cookies["csrftoken"].value, page.split("<input")[0])
+        self.assertIn(f'value="{self.get_token(page)}"', page.split("</a>")[1])
+
+    def test_unknown_hole(self):
+        request = RequestFactory().get("/form/")
+        token = set_hole_scope(request)
+        try:
+            marker = hole_marker("unknown")
+        finally:
+            reset_hole_scope(token)
+        self.assertEqual(fill_holes(f"<p>{marker}</p>", request), "<p></p>")
+
+
+class HoleRenderTest(TestCase):
+    def test_field_hole(self):
+        form = NewsletterForm(initial={"email": "user@example.com"})
+        html = FieldRenderer(form["email"], hole="email").render()
+        self.assertIn('value="[[bootstrap3-hole:email:', html)
+        self.assertNotIn("user@example.com", html)
+
+    def test_form_holes(self):
+        html = FormRenderer(NewsletterForm(), holes={"email": "email"}).render()
+        self.assertIn('name="email" value="[[bootstrap3-hole:email:', html)
+
+    def test_bound_form(self):
+        form = NewsletterForm({"email": "not-an-email"})
+        html = FormRenderer(form, holes={"email": "email"}).render()
+        self.assertIn('value="not-an-email"', html)
+        self.assertNotIn("bootstrap3-hole", html)
+        self.assertIn("Enter a valid email address.", html)
+
+    def test_no_text_value(self):
+        with self.assertRaises(BootstrapError):
+            FieldRenderer(NewsletterForm()["subscribe"], hole="subscribe")
+
+    def test_parse_holes(self):
+        self.assertEqual(parse_holes("email=user_email, name=user_name"), {"email": "user_email", "name": "user_name"})
+        with self.assertRaises(BootstrapError):
+            parse_holes("email")
+        with self.assertRaises(BootstrapError):
+            hole_marker("no spaces")
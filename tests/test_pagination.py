@@ -0,0 +1,152 @@
+import random
+
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.core.paginator import EmptyPage, Paginator
+from django.test import TestCase, override_settings
+
+from bootstrap3.pagination import CachedCountPaginator, CountlessPaginator, get_page_window
+from bootstrap3.templatetags.bootstrap3 import get_pagination_context
+from tests.app.forms import render_template_with_form
+
+
+def legacy_page_window(current_page, num_pages, pages_to_show):
+    """Return the page window as get_pagination_context computed it before get_page_window."""
+    half_page_num = int(pages_to_show / 2)
+    first_page = current_page - half_page_num
+    if first_page <= 1:
+        first_page = 1
+    if first_page > 1:
+        pages_back = first_page - half_page_num
+        if pages_back < 1:
+            pages_back = 1
+    else:
+        pages_back = None
+    last_page = first_page + pages_to_show - 1
+    if pages_back is None:
+        last_page += 1
+    if last_page > num_pages:
+        last_page = num_pages
+    if last_page < num_pages:
+        pages_forward = last_page + half_page_num
+        if pages_forward > num_pages:
+            pages_forward = num_pages
+    else:
+        pages_forward = None
+        if first_page > 1:
+            first_page -= 1
+        if pages_back is not None and pages_back > 1:
+            pages_back -= 1
+        else:
+            pages_back = None
+    return first_page, last_page, pages_back, pages_forward
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "pagination"}}
+
+
+class PageWindowTest(TestCase):
+    def assertSameWindow(self, current_page, num_pages, pages_to_show):
+        self.assertEqual(
+            get_page_window(current_page, num_pages, pages_to_show),
+            legacy_page_window(current_page, num_pages, pages_to_show),
+            msg=f"page {current_page} of {num_pages}, {pages_to_show} pages to show",
+        )
+
+    def test_all_small_page_counts(self):
+        for num_pages in range(1, 81):
+            for current_page in range(1, num_pages + 1):
+                for pages_to_show in range(1, 26):
+                    self.assertSameWindow(current_page, num_pages, pages_to_show)
+
+    def test_huge_page_counts(self):
+        rnd = random.Random(16)
+        for exponent in range(2, 10):
+            for num_pages in (10**exponent - 1, 10**exponent, 10**exponent + 1, rnd.randint(1, 10**exponent)):
+                for pages_to_show in (1, 2, 3, 10, 11, 12, rnd.randint(1, 50)):
+                    edges = range(1, pages_to_show + 3)
+                    current_pages = {*edges, *(num_pages + 1 - page for page in edges), num_pages // 2}
+                    current_pages.update(rnd.randint(1, num_pages) for _ in range(20))
+                    for current_page in current_pages:
+                        if 1 <= current_page <= num_pages:
+                            self.assertSameWindow(current_page, num_pages, pages_to_show)
+
+    def test_window(self):
+        self.assertEqual(get_page_window(1, 1), (1, 1, None, None))
+        self.assertEqual(get_page_window(1, 100), (1, 12, None, 17))
+        self.assertEqual(get_page_window(50, 100), (45, 55, 40, 60))
+        self.assertEqual(get_page_window(100, 100), (94, 100, 89, None))
+        self.assertEqual(get_page_window(500_000_000, 10**9, 5), (499_999_998, 500_000_002, 499_999_996, 500_000_004))
+
+
+class CountlessPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.bulk_create(Group(name=f"group {i:02}") for i in range(25))
+
+    def test_pages(self):
+        paginator = CountlessPaginator(Group.objects.order_by("name"), 10)
+        with self.assertNumQueries(1):
+            page = paginator.page(2)
+            self.assertEqual([group.name for group in page], [f"group {i:02}" for i in range(10, 20)])
+            self.assertTrue(page.has_next())
+            self.assertTrue(page.has_previous())
+            self.assertEqual((page.start_index(), page.end_index()), (11, 20))
+        last_page = paginator.page(3)
+        self.assertEqual(len(last_page), 5)
+        self.assertFalse(last_page.has_next())
+        with self.assertRaises(EmptyPage):
+            last_page.next_page_number()
+        with self.assertRaises(EmptyPage):
+            paginator.page(4)
+        self.assertEqual(paginator.get_page("x").number, 1)
+        self.assertEqual([page.number for page in paginator], [1, 2, 3])
+
+    def test_pagination_without_count(self):
+        page = CountlessPaginator(Group.objects.order_by("name"), 2).page(5)
+        with self.assertNumQueries(0):
+            res = render_template_with_form(
+                '{% bootstrap_pagination page pages_to_show=5 url="/groups" %}', {"page": page}
+            )
+        self.assertIn('<a href="/groups?page=6">6</a>', res)
+        self.assertNotIn("page=7", res)
+        self.assertIn('<li class="next">\n                    <a href="/groups?page=6">&raquo;</a>', res)
+        self.assertNotIn('class="last', res)
+
+    def test_countless_context(self):
+        page = CountlessPaginator(Group.objects.order_by("name"), 10).page(3)
+        context = get_pagination_context(page, pages_to_show=5)
+        self.assertTrue(context["countless"])
+        self.assertIsNone(context["num_pages"])
+        self.assertIsNone(context["last_page_url"])
+        self.assertIsNone(context["next_page_url"])
+        self.assertEqual(context["pages_shown"], [1, 2, 3])
+
+    def test_countless_kwarg(self):
+        page = Paginator(range(100), 10).page(3)
+        context = get_pagination_context(page, pages_to_show=5, countless=True)
+        self.assertEqual(context["pages_shown"][-1], 4)
+        self.assertEqual(context["next_page_url"], "?page=4")
+        self.assertFalse(get_pagination_context(page)["countless"])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedCountPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.bulk_create(Group(name=f"group {i:02}") for i in range(25))
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_count_is_cached(self):
+        self.assertEqual(CachedCountPaginator(Group.objects.order_by("name"), 10).num_pages, 3)
+        Group.objects.create(name="new")
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(Group.objects.order_by("name"), 10).count, 25)
+        self.assertEqual(CachedCountPaginator(Group.objects.filter(name__startswith="n").order_by("name"), 10).count, 1)
+
+    def test_cache_key(self):
+        self.assertEqual(CachedCountPaginator(list(range(5)), 2, cache_key="numbers").count, 5)
+        self.assertEqual(CachedCountPaginator(list(range(9)), 2, cache_key="numbers").count, 5)
+        self.assertEqual(CachedCountPaginator(list(range(9)), 2).count, 9)
@@ -0,0 +1,62 @@
+from django.http import HttpResponse, JsonResponse
+from django.test import TestCase, override_settings
+from django.urls import path
+
+from bootstrap3.middleware import PreloadMiddleware
+from bootstrap3.responses import add_preload_headers
+
+
+def page_view(request):
+    response = HttpResponse("<html></html>")
+    response["Link"] = "</favicon.ico>; rel=preload; as=image"
+    return response
+
+
+def json_view(request):
+    return JsonResponse({})
+
+
+urlpatterns = [path("page/", page_view), path("json/", json_view)]
+
+
+class JQueryPreloadMiddleware(PreloadMiddleware):
+    jquery = True
+
+
+@override_settings(
+    ROOT_URLCONF="tests.test_preload",
+    MIDDLEWARE=["bootstrap3.middleware.PreloadMiddleware"],
+    BOOTSTRAP3={
+        "css_url": {"url": "/static/bootstrap.css", "integrity": "sha384-css", "crossorigin": "anonymous"},
+        "javascript_url": {"url": "/static/bootstrap.js", "integrity": "sha384-js"},
+        "jquery_url": "/static/jquery.js",
+    },
+)
+class PreloadTest(TestCase):
+    def test_middleware(self):
+        response = self.client.get("/page/")
+        self.assertEqual(
+            response["Link"],
+            "</favicon.ico>; rel=preload; as=image, "
+            '</static/bootstrap.css>; rel=preload; as=style; crossorigin=anonymous; integrity="sha384-css", '
+            '</static/bootstrap.js>; rel=preload; as=script; integrity="sha384-js"',
+        )
+        self.assertFalse(self.client.get("/json/").has_header("Link"))
+
+    @override_settings(MIDDLEWARE=["tests.test_preload.JQueryPreloadMiddleware"])
+    def test_jquery(self):
+        self.assertIn(
+            "</static/jquery.js>; rel=preload; as=script, </static/bootstrap.js>", self.client.get("/page/")["Link"]
+        )
+
+    def test_add_preload_headers(self):
+        response = add_preload_headers(HttpResponse(), jquery=True)
+        self.assertEqual(response["Link"].count("rel=preload"), 3)
+        with self.settings(BOOTSTRAP3={"css_url": None, "javascript_url": None}):
+            self.assertFalse(add_preload_headers(HttpResponse()).has_header("Link"))
+
+    def test_modulepreload(self):
+        with self.settings(BOOTSTRAP3={"javascript_url": "/static/bootstrap.js", "javascript_loading": "module"}):
+            links = add_preload_headers(HttpResponse())["Link"]
+        self.assertIn("</static/bootstrap.js>; rel=modulepreload; as=script", links)
+        self.assertIn("rel=preload; as=style", links)
@@ -0,0 +1,73 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from bootstrap3.css import find_css_classes, get_library_css_classes, purge_css
+
+FIXTURE_CSS = os.path.join(os.path.dirname(__file__), "fixtures", "bootstrap-excerpt.css")
+
+
+class PurgeCssTest(TestCase):
+    def test_purge_css(self):
+        css = purge_css("/*! license */.btn{a:b}.table{c:d}a.btn,a.table:hover{e:f}@media print{.table{g:h}}", {"btn"})
+        self.assertEqual(css, "/*! license */\n.btn{a:b}a.btn{e:f}")
+
+    def test_find_css_classes(self):
+        classes = find_css_classes('<p class="lead {% if x %}text-muted{% endif %}">{% bootstrap_icon "star" %}')
+        self.assertTrue({"lead", "text-muted", "glyphicon-star", "btn-lead"} <= classes)
+
+    @override_settings(BOOTSTRAP3={"horizontal_label_class": "col-sm-2 control-label"})
+    def test_library_classes(self):
+        classes = get_library_css_classes()
+        self.assertTrue({"form-group", "input-group-addon", "col-sm-2", "col-md-9", "has-error"} <= classes)
+
+
+class PurgeCssCommandTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.output = os.path.join(self.tmp, "css", "bootstrap.min.css")
+        with open(os.path.join(self.tmp, "page.html"), "w", encoding="utf-8") as f:
+            f.write('<div class="navbar">{% bootstrap_icon "heart" %}</div>')
+
+    def purge(self, *args):
+        templates = [{"BACKEND": "django.template.backends.django.DjangoTemplates", "DIRS": [self.tmp]}]
+        with override_settings(TEMPLATES=templates):
+            call_command(
+                "bootstrap3_purge_css", "--css", FIXTURE_CSS, "--output", self.output, *args, stdout=StringIO()
+            )
+        with open(self.output, encoding="utf-8") as f:
+            return f.read()
+
+    def test_command(self):
+        css = self.purge()
+        self.assertTrue(css.startswith("/*!\n * An excerpt of Bootstrap v3.4.1"))
+        for kept in (
+            "html{",
+            "a:hover,a:focus{",
+            ".navbar{",
+            ".btn-primary{",
+            ".glyphicon-heart:before",
+            "@font-face{",
+        ):
+            self.assertIn(kept, css)
+        for left_out in (".container", ".glyphicon-star", ".table-responsive", "progress-bar", "#footer"):
+            self.assertNotIn(left_out, css)
+        self.assertIn("@media print{", css)
+
+    def test_scan_and_safelist(self):
+        with open(os.path.join(self.tmp, "widgets.py"), "w", encoding="utf-8") as f:
+            f.write('attrs = {"class": "progress-bar"}')
+        css = self.purge("--no-templates", "--scan", os.path.join(self.tmp, "widgets.py"), "--safelist", "container")
+        self.assertIn(".progress-bar.active{", css)
+        self.assertIn("@keyframes progress-bar-stripes{", css)
+        self.assertIn(".container{", css)
+        self.assertNotIn(".navbar{", css)
+
+    def test_errors(self):
+        with self.assertRaises(CommandError):
+            self.purge("--scan", os.path.join(self.tmp, "missing"))
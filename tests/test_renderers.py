@@ -0,0 +1,539 @@
+import os
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from django import forms
+from django.contrib.auth.models import Group
+from django.forms import formset_factory
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.safestring import mark_safe
+
+from bootstrap3.exceptions import BootstrapError
+from bootstrap3.renderers import (
+    WIDGET_PLAN_CACHE_SIZE,
+    FieldRenderer,
+    FormRenderer,
+    FormsetRenderer,
+    InlineFieldRenderer,
+    get_widget_plan,
+    render_field_help_text_and_errors,
+    render_form_errors_alert,
+)
+from bootstrap3.responses import formset_fragment_response, streaming_formset_response
+from bootstrap3.utils import is_template_overridden, render_template_file
+from bootstrap3.widgets import get_widget_behaviour, register_widget
+from tests.app.forms import SmallTestForm, TestForm, render_template_with_form
+
+
+class WidgetPlanTest(TestCase):
+    def test_plan_is_shared(self):
+        form = TestForm()
+        renderer_a = FieldRenderer(form["subject"])
+        renderer_b = FieldRenderer(form["message"])
+        self.assertIs(renderer_a.widget_plan, renderer_b.widget_plan)
+        self.assertIsNot(renderer_a.widget_plan, InlineFieldRenderer(form["subject"]).widget_plan)
+
+    def test_plan(self):
+        form = TestForm()
+        plan = FieldRenderer(form["subject"]).widget_plan
+        self.assertEqual(plan.form_control_class, "form-control")
+        self.assertTrue(plan.has_placeholder)
+        self.assertTrue(plan.has_input_group)
+        self.assertIsNone(plan.post_render)
+        plan = FieldRenderer(form["cc_myself"]).widget_plan
+        self.assertEqual(plan.form_control_class, "")
+        self.assertTrue(plan.is_checkbox)
+        self.assertEqual(plan.post_render, ("put_inside_label",))
+        plan = FieldRenderer(form["category2"]).widget_plan
+        self.assertEqual(plan.post_render, ("list_to_class", "checkbox"))
+        self.assertTrue(FieldRenderer(form["datetime"]).widget_plan.is_multi_widget)
+
+    def test_plan_follows_renderer_class(self):
+        class NoFormControlRenderer(FieldRenderer):
+            WIDGETS_NO_FORM_CONTROL = (forms.TextInput,)
+
+        form = TestForm()
+        html = NoFormControlRenderer(form["subject"]).render()
+        self.assertNotIn("form-control", html)
+        self.assertIn("form-control", FieldRenderer(form["subject"]).render())
+
+    def test_plans_are_bounded(self):
+        form = TestForm()
+        plan = FieldRenderer(form["subject"]).widget_plan
+        for _ in range(WIDGET_PLAN_CACHE_SIZE + 1):
+            # Classes created on the fly do not stay in the cache forever
+            get_widget_plan(type("DynamicFieldRenderer", (FieldRenderer,), {}), forms.TextInput)
+        self.assertEqual(get_widget_plan.cache_info().currsize, WIDGET_PLAN_CACHE_SIZE)
+        self.assertIsNot(FieldRenderer(form["subject"]).widget_plan, plan)
+
+    def test_plans_are_reset(self):
+        form = TestForm()
+        plan = FieldRenderer(form["subject"]).widget_plan
+        with self.settings(BOOTSTRAP3={}):
+            self.assertIsNot(FieldRenderer(form["subject"]).widget_plan, plan)
+
+
+class WidgetRegistryTest(TestCase):
+    def test_behaviour_follows_mro(self):
+        class FancyCheckboxes(forms.CheckboxSelectMultiple):
+            pass
+
+        behaviour = get_widget_behaviour(FancyCheckboxes)
+        self.assertIs(behaviour, get_widget_behaviour(FancyCheckboxes))
+        self.assertEqual(behaviour["post_render"], ("list_to_class", "checkbox"))
+        self.assertEqual(behaviour["form_control_class"], "")
+        self.assertFalse(behaviour["has_required_attribute"])
+        register_widget(FancyCheckboxes, form_control_class="fancy")
+        behaviour = get_widget_behaviour(FancyCheckboxes)
+        self.assertEqual(behaviour["form_control_class"], "fancy")
+        self.assertEqual(behaviour["post_render"], ("list_to_class", "checkbox"))
+        self.assertTrue(get_widget_behaviour(forms.DateInput)["has_placeholder"])
+        self.assertFalse(get_widget_behaviour(forms.PasswordInput)["has_hole"])
+
+    def test_register_widget(self):
+        class DatePickerInput(forms.widgets.Input):
+            input_type = "text"
+
+        class DateForm(forms.Form):
+            date = forms.CharField(widget=DatePickerInput)
+
+        html = FieldRenderer(DateForm()["date"], addon_before="@").render()
+        self.assertNotIn("placeholder", html)
+        self.assertNotIn("input-group", html)
+        register_widget(
+            DatePickerInput,
+            has_placeholder=True,
+            has_input_group=True,
+            post_render=lambda renderer, html: f'<div class="picker">{html}</div>',
+        )
+        html = FieldRenderer(DateForm()["date"], addon_before="@").render()
+        self.assertIn('placeholder="Date"', html)
+        self.assertIn(
+            '<div class="input-group"><span class="input-group-addon">@</span><div class="picker"><input', html
+        )
+
+    def test_late_registration(self):
+        class BaseWidget(forms.TextInput):
+            pass
+
+        class DerivedWidget(BaseWidget):
+            pass
+
+        class DerivedForm(forms.Form):
+            name = forms.CharField(widget=DerivedWidget)
+
+        self.assertIn('class="form-control"', FieldRenderer(DerivedForm()["name"]).render())
+        # Registering a base class after the subclass was resolved and rendered changes the subclass
+        register_widget(BaseWidget, form_control_class="form-control-static", add_size_class=False)
+        self.assertEqual(get_widget_behaviour(DerivedWidget)["form_control_class"], "form-control-static")
+        self.assertIn('class="form-control-static"', FieldRenderer(DerivedForm()["name"]).render())
+
+    def test_unknown_behaviour(self):
+        with self.assertRaises(BootstrapError):
+            register_widget(forms.TextInput, has_datepicker=True)
+
+
+class DictFieldRenderer(FieldRenderer):
+    """A subclass without __slots__, like most subclasses in projects."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.extra = kwargs.get("extra")
+
+
+class InstanceDictFieldRenderer(FieldRenderer):
+    """Keeps its state in an instance dict, like the renderers did before they had slots."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                self.__dict__[name] = getattr(self, name)
+
+
+def get_allocated_bytes(func, number=200):
+    """Return the memory that the results of `func` hold on to, per call."""
+    func()  # Fill the caches first
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [func() for _ in range(number)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del results
+    return allocated / number
+
+
+class RendererSlotsTest(TestCase):
+    def test_renderers_have_no_instance_dict(self):
+        form = TestForm()
+        for renderer in [
+            FieldRenderer(form["subject"]),
+            InlineFieldRenderer(form["subject"]),
+            FormRenderer(form),
+            FormsetRenderer(formset_factory(SmallTestForm)()),
+            FieldRenderer(form["subject"]).widget_plan,
+        ]:
+            self.assertFalse(hasattr(renderer, "__dict__"), type(renderer))
+
+    def test_subclasses_can_add_attributes(self):
+        form = TestForm()
+        renderer = DictFieldRenderer(form["subject"], extra="value")
+        self.assertEqual(renderer.extra, "value")
+        renderer.other = 1
+        self.assertEqual(renderer.render(), FieldRenderer(form["subject"]).render())
+
+    def test_fewer_allocations_per_field(self):
+        form = TestForm()
+        slotted = get_allocated_bytes(lambda: FieldRenderer(form["subject"]))
+        with_dict = get_allocated_bytes(lambda: InstanceDictFieldRenderer(form["subject"]))
+        # An instance dict with the state of a field renderer takes a few hundred bytes
+        self.assertLess(slotted + 200, with_dict)
+        # Attributes that subclasses add only cost their own dict entries
+        self.assertLess(get_allocated_bytes(lambda: DictFieldRenderer(form["subject"])), with_dict)
+
+    def test_field_options_are_shared(self):
+        renderer = FormRenderer(TestForm(), size="lg")
+        self.assertIs(renderer.get_field_kwargs(), renderer.get_field_kwargs())
+        self.assertEqual(renderer.get_field_kwargs()["size"], "large")
+        self.assertEqual(renderer.parse_size("large"), "large")
+
+
+class WidgetAttrsTest(TestCase):
+    def test_widget_is_not_changed(self):
+        form = TestForm()
+        attrs = {name: field.widget.attrs.copy() for name, field in form.fields.items()}
+        subwidget_attrs = [widget.attrs.copy() for widget in form.fields["datetime"].widget.widgets]
+        FieldRenderer(form["addon"], size="lg").render()
+        FieldRenderer(form["datetime"], size="sm").render()
+        InlineFieldRenderer(form["subject"]).render()
+        self.assertEqual(attrs, {name: field.widget.attrs for name, field in form.fields.items()})
+        self.assertEqual(subwidget_attrs, [widget.attrs for widget in form.fields["datetime"].widget.widgets])
+
+    def test_render_is_repeatable(self):
+        form = TestForm()
+        html = FieldRenderer(form["datetime"]).render()
+        FieldRenderer(form["datetime"], size="sm").render()
+        self.assertEqual(html, FieldRenderer(form["datetime"]).render())
+        self.assertEqual(FieldRenderer(form["addon"]).render(), FieldRenderer(form["addon"]).render())
+
+    def test_deprecated_restore_widget_attrs(self):
+        class OldFieldRenderer(FieldRenderer):
+            def _render(self):
+                html = super()._render()
+                self.restore_widget_attrs()
+                return html
+
+        form = TestForm()
+        with self.assertWarns(DeprecationWarning):
+            html = OldFieldRenderer(form["subject"]).render()
+        self.assertEqual(html, FieldRenderer(form["subject"]).render())
+        with self.assertWarns(DeprecationWarning):
+            self.assertEqual(FieldRenderer(form["subject"]).initial_attrs, form.fields["subject"].widget.attrs)
+
+    def test_concurrent_render(self):
+        form = TestForm()
+        options = [
+            {},
+            {"size": "sm"},
+            {"size": "lg", "show_label": False},
+            {"layout": "horizontal"},
+            {"layout": "inline"},
+        ]
+        expected = [str(FormRenderer(form, **kwargs).render()) for kwargs in options]
+        jobs = [i % len(options) for i in range(200)]
+
+        def render(i):
+            return i, str(FormRenderer(form, **options[i]).render())
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for i, html in executor.map(render, jobs):
+                self.assertEqual(html, expected[i])
+
+
+class TemplateFreeRenderTest(TestCase):
+    ERRORS = [
+        [],
+        ["This field is required."],
+        ["<b>unsafe</b>", mark_safe("<b>safe</b>"), "a & b"],
+        ["with <br> inside", "second"],
+    ]
+
+    def test_field_help_text_and_errors(self):
+        for errors in self.ERRORS:
+            for help_text in ["", "help <i>me</i>", mark_safe("help <i>me</i>")]:
+                expected = render_template_file(
+                    "bootstrap3/field_help_text_and_errors.html",
+                    context={"errors": errors, "help_text": help_text},
+                )
+                self.assertEqual(render_field_help_text_and_errors(errors, help_text), expected)
+
+    def test_form_errors(self):
+        for errors in self.ERRORS:
+            expected = render_template_file("bootstrap3/form_errors.html", context={"errors": errors})
+            self.assertEqual(render_form_errors_alert(errors), expected)
+
+    def test_overridden_template(self):
+        self.assertFalse(is_template_overridden("bootstrap3/field_error.html"))
+        self.assertFalse(is_template_overridden("bootstrap3/form_errors.html"))
+        form = SmallTestForm({"sender": "sender"})
+        with tempfile.TemporaryDirectory() as templates_dir:
+            os.mkdir(os.path.join(templates_dir, "bootstrap3"))
+            with open(os.path.join(templates_dir, "bootstrap3", "field_error.html"), "w") as f:
+                f.write('<p class="custom-error">{{ error }}</p>')
+            with open(os.path.join(templates_dir, "bootstrap3", "form_errors.html"), "w") as f:
+                f.write('<p class="custom-form-errors">{{ errors|join:"|" }}</p>')
+            with override_settings(
+                TEMPLATES=[
+                    {
+                        "BACKEND": "django.template.backends.django.DjangoTemplates",
+                        "DIRS": [templates_dir],
+                        "APP_DIRS": True,
+                    }
+                ]
+            ):
+                self.assertTrue(is_template_overridden("bootstrap3/field_error.html"))
+                html = FormRenderer(form, error_types="all").render()
+                self.assertIn('<p class="custom-error">', html)
+                self.assertIn('<p class="custom-form-errors">', html)
+        self.assertFalse(is_template_overridden("bootstrap3/field_error.html"))
+
+
+class IterRenderTest(TestCase):
+    def test_formset(self):
+        TestFormSet = formset_factory(TestForm, extra=3)
+        for formset in [TestFormSet(), TestFormSet({"form-TOTAL_FORMS": "2", "form-INITIAL_FORMS": "0"})]:
+            renderer = FormsetRenderer(formset, layout="horizontal")
+            chunks = list(renderer.iter_render())
+            self.assertEqual(len(chunks), len(formset.forms) + 2)
+            self.assertEqual("".join(chunks), renderer.render())
+
+    def test_form(self):
+        for form in [TestForm(), SmallTestForm({"sender": "sender"})]:
+            renderer = FormRenderer(form, error_types="all")
+            chunks = list(renderer.iter_render())
+            self.assertEqual(len(chunks), len(form.fields) + 1)
+            self.assertEqual("".join(chunks), renderer.render())
+
+    def test_overridden_render_methods(self):
+        class NumberedFormRenderer(FormRenderer):
+            def render_fields(self):
+                return "<ol>" + "".join(f"<li>{field}</li>" for field in self.iter_render_fields()) + "</ol>"
+
+        class WrappedFormsetRenderer(FormsetRenderer):
+            def render_forms(self):
+                return f'<div class="forms">{super().render_forms()}</div>'
+
+        renderer = NumberedFormRenderer(TestForm())
+        self.assertEqual(list(renderer.iter_render()), [renderer.render()])
+        self.assertIn("<ol><li>", renderer.render())
+        renderer = WrappedFormsetRenderer(formset_factory(TestForm, extra=2)())
+        self.assertEqual(list(renderer.iter_render()), [renderer.render()])
+        self.assertIn('<div class="forms">', renderer.render())
+
+    def test_streaming_formset_response(self):
+        formset = formset_factory(TestForm, extra=2)()
+        response = streaming_formset_response(formset, head="<form>", tail="</form>")
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(content, "<form>" + FormsetRenderer(formset).render() + "</form>")
+
+
+class FormsetWindowTest(TestCase):
+    def setUp(self):
+        self.formset = formset_factory(SmallTestForm, extra=5)()
+
+    def test_window(self):
+        res = render_template_with_form("{% bootstrap_formset formset offset=1 limit=2 %}", {"formset": self.formset})
+        self.assertIn('name="form-TOTAL_FORMS" value="5"', res)
+        self.assertNotIn('name="form-0-sender"', res)
+        self.assertIn('name="form-1-sender"', res)
+        self.assertIn('name="form-2-sender"', res)
+        self.assertNotIn('name="form-3-sender"', res)
+
+    def test_window_until_end(self):
+        res = render_template_with_form("{% bootstrap_formset formset offset=3 %}", {"formset": self.formset})
+        self.assertNotIn('name="form-2-sender"', res)
+        self.assertIn('name="form-4-sender"', res)
+
+    def test_window_builds_forms_in_window(self):
+        formset = formset_factory(SmallTestForm, extra=5)()
+        renderer = FormsetRenderer(formset, offset=1, limit=2)
+        self.assertEqual([form.prefix for form in renderer.get_forms()], ["form-1", "form-2"])
+        self.assertNotIn("forms", formset.__dict__)
+        self.assertEqual([form.prefix for form in FormsetRenderer(formset, offset=4, limit=9).get_forms()], ["form-4"])
+        # Forms that were built already are used
+        forms = formset.forms
+        self.assertIs(FormsetRenderer(formset, offset=2, limit=1).get_forms()[0], forms[2])
+
+    def test_invalid_window(self):
+        with self.assertRaises(BootstrapError):
+            FormsetRenderer(self.formset, offset=-1)
+        with self.assertRaises(BootstrapError):
+            FormsetRenderer(self.formset, limit="many")
+
+    def test_fragment_response(self):
+        request = RequestFactory().get("/", {"offset": "3"})
+        response = formset_fragment_response(request, self.formset)
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertNotIn("TOTAL_FORMS", content)
+        self.assertIn('name="form-3-sender"', content)
+        self.assertNotIn('name="form-4-sender"', content)
+        self.assertEqual(content, FormsetRenderer(self.formset, offset=3, limit=1).render_forms())
+
+    def test_fragment_response_limit(self):
+        formset = formset_factory(SmallTestForm, extra=5, max_num=2)()
+        request = RequestFactory().get("/", {"offset": "0", "limit": "1000000"})
+        content = formset_fragment_response(request, formset).content.decode()
+        self.assertIn('name="form-1-sender"', content)
+        self.assertNotIn('name="form-2-sender"', content)
+
+    def test_fragment_response_invalid(self):
+        request = RequestFactory().get("/", {"offset": "3", "limit": "x"})
+        self.assertEqual(formset_fragment_response(request, self.formset).status_code, 400)
+
+
+class UnstampedFormsetRenderer(FormsetRenderer):
+    def get_first_stamped_form_index(self):
+        return None
+
+
+class FormsetEmptyFormTest(TestCase):
+    def assertStampedEqual(self, formset, **kwargs):
+        self.assertEqual(
+            FormsetRenderer(formset, **kwargs).render(),
+            UnstampedFormsetRenderer(formset, **kwargs).render(),
+        )
+
+    def test_extra_forms_are_stamped(self):
+        formset = formset_factory(SmallTestForm, extra=4)()
+        renderer = FormsetRenderer(formset)
+        html = renderer.render()
+        self.assertIsNotNone(renderer._empty_form_html)
+        self.assertIn("__prefix__", renderer._empty_form_html)
+        self.assertNotIn("__prefix__", html)
+        self.assertEqual(html, UnstampedFormsetRenderer(formset).render())
+
+    def test_same_output(self):
+        formset_cls = formset_factory(TestForm, extra=3, min_num=1, can_delete=True, can_order=True)
+        self.assertStampedEqual(formset_cls())
+        self.assertStampedEqual(formset_cls(initial=[{"subject": "initial"}]), layout="horizontal")
+        self.assertStampedEqual(formset_cls(prefix="items", form_kwargs={"initial": {"subject": "s"}}), size="sm")
+        self.assertStampedEqual(formset_cls(), offset=2, limit=2)
+        self.assertStampedEqual(formset_cls({"form-TOTAL_FORMS": "3", "form-INITIAL_FORMS": "0"}))
+
+    def test_changed_form_is_rendered(self):
+        formset = formset_factory(SmallTestForm, extra=3)()
+        formset.forms[2].fields["subject"].label = "Changed"
+        html = FormsetRenderer(formset).render()
+        self.assertEqual(html.count("Changed"), 1)
+        self.assertEqual(html, UnstampedFormsetRenderer(formset).render())
+
+    def test_prefix_in_text(self):
+        class PrefixTextForm(forms.Form):
+            code = forms.CharField(initial="form-__prefix__", help_text="Use form-__prefix__-code in the template.")
+
+        formset = formset_factory(PrefixTextForm, extra=2)()
+        html = FormsetRenderer(formset).render()
+        self.assertEqual(html, UnstampedFormsetRenderer(formset).render())
+        self.assertIn('name="form-1-code"', html)
+        self.assertEqual(html.count('value="form-__prefix__"'), 2)
+
+    def test_signature(self):
+        formset = formset_factory(SmallTestForm, extra=2)()
+        renderer = FormsetRenderer(formset)
+        form, other_form = formset.forms
+        self.assertEqual(renderer.get_form_signature(form), renderer.get_form_signature(other_form))
+        other_form.label_suffix = "?"
+        self.assertNotEqual(renderer.get_form_signature(form), renderer.get_form_signature(other_form))
+        other_form = formset.empty_form
+        other_form.error_class = type("OtherErrorList", (forms.utils.ErrorList,), {})
+        self.assertNotEqual(renderer.get_form_signature(form), renderer.get_form_signature(other_form))
+
+    def test_callable_initial(self):
+        counter = iter(range(100))
+
+        class CallableInitialForm(forms.Form):
+            number = forms.IntegerField(initial=lambda: next(counter))
+
+        formset = formset_factory(CallableInitialForm, extra=3)()
+        html = FormsetRenderer(formset).render()
+        self.assertIn('value="0"', html)
+        self.assertIn('value="2"', html)
+
+    def test_widget_with_script(self):
+        class ScriptInput(forms.TextInput):
+            def render(self, name, value, attrs=None, renderer=None):
+                html = super().render(name, value, attrs, renderer)
+                return mark_safe(f'{html}<script>$("#{attrs["id"]}").datepicker();</script>')
+
+        class ScriptForm(forms.Form):
+            date = forms.CharField(widget=ScriptInput)
+
+        self.assertFalse(get_widget_behaviour(ScriptInput)["stampable"])
+        formset = formset_factory(ScriptForm, extra=2)()
+        renderer = FormsetRenderer(formset)
+        html = renderer.render()
+        self.assertIsNone(renderer._empty_form_html)
+        self.assertEqual(html, UnstampedFormsetRenderer(formset).render())
+        self.assertIn('$("#id_form-1-date")', html)
+        self.assertNotIn("__prefix__", html)
+
+    def test_overridden_render_form(self):
+        class MarkedFormsetRenderer(FormsetRenderer):
+            def render_form(self, form, **kwargs):
+                return f"<!-- {form.prefix} -->{super().render_form(form, **kwargs)}"
+
+        formset = formset_factory(SmallTestForm, extra=2)()
+        renderer = MarkedFormsetRenderer(formset)
+        html = renderer.render()
+        self.assertIsNone(renderer._empty_form_html)
+        self.assertIn("<!-- form-1 -->", html)
+
+    def test_empty_form_tag(self):
+        formset = formset_factory(SmallTestForm, extra=1)()
+        res = render_template_with_form("{% bootstrap_formset_empty_form formset %}", {"formset": formset})
+        self.assertIn('name="form-__prefix__-sender"', res)
+        self.assertNotIn("TOTAL_FORMS", res)
+
+
+class GroupForm(forms.Form):
+    group = forms.ModelChoiceField(queryset=Group.objects.all())
+    groups = forms.ModelMultipleChoiceField(queryset=Group.objects.all(), required=False)
+
+
+class SharedChoicesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.groups = [Group.objects.create(name=f"group {i}") for i in range(3)]
+
+    def get_formset(self, count, **kwargs):
+        initial = [{"group": self.groups[i % 3].pk} for i in range(count)]
+        return formset_factory(GroupForm, extra=0, **kwargs)(initial=initial)
+
+    def test_queries_do_not_grow_with_forms(self):
+        for count in (2, 10):
+            formset = self.get_formset(count)
+            with self.assertNumQueries(2):
+                html = FormsetRenderer(formset).render()
+            self.assertEqual(html.count(f'<option value="{self.groups[1].pk}" selected>'), (count + 1) // 3)
+
+    def test_extra_forms(self):
+        formset = formset_factory(GroupForm, extra=5)()
+        with self.assertNumQueries(2):
+            html = FormsetRenderer(formset).render()
+        self.assertEqual(html.count("group 2</option>"), 10)
+
+    def test_same_output(self):
+        formset = self.get_formset(4)
+        html = FormsetRenderer(formset).render()
+        unshared = "\n".join(str(FormRenderer(form).render()) for form in formset)
+        self.assertIn(unshared, html)
+
+    def test_different_querysets_are_not_shared(self):
+        formset = self.get_formset(2)
+        formset.forms[1].fields["group"].queryset = Group.objects.filter(pk=self.groups[0].pk)
+        html = FormsetRenderer(formset).render()
+        self.assertEqual(html.count("group 1</option>"), 3)
@@ -1,6 +1,9 @@
 from django.test import TestCase, override_settings
 
-from bootstrap3.bootstrap import get_bootstrap_setting
+from bootstrap3.bootstrap import get_bootstrap_setting, get_bootstrap_settings, get_field_renderer, load_renderers
+from bootstrap3.components import render_css, render_javascript
+from bootstrap3.exceptions import BootstrapError
+from bootstrap3.renderers import FieldRenderer, InlineFieldRenderer
 from tests.app.forms import TestForm, render_template_with_form
 
 
@@ -54,3 +57,52 @@ class SettingsTest(TestCase):
     def test_setting_to_none(self):
         css_url = get_bootstrap_setting("css_url")
         self.assertIsNone(css_url)
+
+    def test_settings_are_cached(self):
+        self.assertIs(get_bootstrap_settings(), get_bootstrap_settings())
+        self.assertEqual(get_bootstrap_settings().required_css_class, "bootstrap3-req")
+
+    def test_settings_are_read_only(self):
+        with self.assertRaises(AttributeError):
+            get_bootstrap_settings().required_css_class = "foo"
+
+    def test_override_settings_resets_cache(self):
+        cached = get_bootstrap_settings()
+        with override_settings(BOOTSTRAP3={"horizontal_label_class": "overridden"}):
+            self.assertIsNot(get_bootstrap_settings(), cached)
+            self.assertEqual(get_bootstrap_settings().horizontal_label_class, "overridden")
+            res = render_template_with_form('{% bootstrap_form form layout="horizontal" %}', {"form": TestForm()})
+            self.assertIn("overridden", res)
+        self.assertEqual(get_bootstrap_settings().required_css_class, "bootstrap3-req")
+
+    def test_renderer_classes(self):
+        self.assertIs(get_field_renderer(), FieldRenderer)
+        self.assertIs(get_field_renderer(layout="inline"), InlineFieldRenderer)
+        self.assertIs(get_field_renderer(layout="horizontal"), FieldRenderer)
+        with override_settings(BOOTSTRAP3={"field_renderers": {"default": "bootstrap3.renderers.InlineFieldRenderer"}}):
+            self.assertIs(get_field_renderer(), InlineFieldRenderer)
+        self.assertIs(get_field_renderer(), FieldRenderer)
+
+    @override_settings(BOOTSTRAP3={"field_renderers": {"default": "bootstrap3.renderers.DoesNotExist"}})
+    def test_load_renderers_invalid(self):
+        with self.assertRaises(BootstrapError):
+            load_renderers()
+
+    def test_asset_tags_are_cached(self):
+        self.assertIs(render_css(), render_css())
+        self.assertIs(render_javascript(jquery=True), render_javascript(jquery=True))
+        self.assertNotIn("jquery", render_javascript(jquery=False))
+        with override_settings(BOOTSTRAP3={"css_url": "/static/bootstrap.css", "jquery_url": "/static/jquery.js"}):
+            self.assertEqual(render_css(), '<link href="/static/bootstrap.css" rel="stylesheet">')
+            self.assertIn('<script src="/static/jquery.js"></script>', render_javascript(jquery=True))
+        self.assertIn("//example.com/theme.css", render_css())
+        self.assertIn("code.jquery.com", render_javascript(jquery=True))
+
+    def test_asset_tags_are_cached_per_loading(self):
+        self.assertNotIn("defer", render_javascript())
+        self.assertIn("defer", render_javascript(loading="defer"))
+        with override_settings(BOOTSTRAP3={"javascript_loading": "module"}):
+            self.assertIn('type="module"', render_javascript())
+        self.assertNotIn("module", render_javascript())
+        with self.assertRaises(BootstrapError):
+            render_javascript(loading="async")
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from tests.app.forms import render_template, render_template_with_form
 
@@ -30,3 +30,20 @@ class TemplateTest(TestCase):
         res = render_template_with_form("{% bootstrap_javascript jquery=1 %}")
         self.assertIn("bootstrap", res)
         self.assertIn("jquery", res)
+
+    def test_javascript_loading(self):
+        res = render_template_with_form('{% bootstrap_javascript jquery=1 loading="defer" %}')
+        self.assertIn('<script src="//code.jquery.com/jquery.min.js" defer></script><script crossorigin=', res)
+        self.assertEqual(res.count(" defer></script>"), 2)
+        res = render_template_with_form('{% bootstrap_javascript jquery=1 loading="module" %}')
+        self.assertIn('<script src="//code.jquery.com/jquery.min.js" type="module"></script>', res)
+        self.assertNotIn("defer", res)
+
+    @override_settings(BOOTSTRAP3={"javascript_loading": "defer"})
+    def test_javascript_loading_setting(self):
+        self.assertIn(" defer></script>", render_template_with_form("{% bootstrap_javascript %}"))
+        self.assertNotIn(" defer", render_template_with_form('{% bootstrap_javascript loading="" %}'))
+        res = render_template('{% extends "bootstrap3/bootstrap3.html" %}')
+        head, body = res.split("<body>")
+        self.assertIn('<script src="//code.jquery.com/jquery.min.js" defer></script>', head)
+        self.assertNotIn("<script", body)
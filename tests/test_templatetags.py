@@ -1,15 +1,30 @@
+import os
+import random
 import re
+import tempfile
 
 from django import forms
 from django.contrib.messages import constants as DEFAULT_MESSAGE_LEVELS
+from django.contrib.messages.storage.base import Message
+from django.core.paginator import Paginator
 from django.forms import formset_factory
-from django.test import TestCase
+from django.forms.utils import flatatt
+from django.template import Context, engines
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+from django.utils.html import format_html
+from django.utils.safestring import SafeString, mark_safe
+from django.utils.translation import gettext_lazy
 
 from bootstrap3.exceptions import BootstrapError
+from bootstrap3.templatetags.bootstrap3 import get_pagination_context
 from bootstrap3.text import text_concat, text_value
 from bootstrap3.utils import (
     add_css_class,
+    remove_css_class,
     render_tag,
+    url_param_replacer,
+    url_replace_param,
     url_to_attrs_dict,
 )
 from tests.app.forms import (
@@ -430,6 +445,39 @@ class MessagesTest(TestCase):
         """
         self.assertEqual(re.sub(pattern, "", res), re.sub(pattern, "", expected))
 
+    def test_messages_same_as_template(self):
+        messages = [
+            Message(DEFAULT_MESSAGE_LEVELS.INFO, "<b>unsafe</b> & more"),
+            Message(DEFAULT_MESSAGE_LEVELS.SUCCESS, mark_safe("<b>safe</b>"), extra_tags='x"y'),
+            Message(99, "unknown level\nsecond line"),
+        ]
+        template = engines["django"].engine.get_template("bootstrap3/messages.html")
+        for context in [{}, {"messages": []}, {"messages": messages}]:
+            expected = template.render(Context({**context, "message_constants": DEFAULT_MESSAGE_LEVELS}))
+            self.assertEqual(render_template_with_form("{% bootstrap_messages %}", context), expected)
+
+    def test_messages_overridden_template(self):
+        with tempfile.TemporaryDirectory() as templates_dir:
+            os.mkdir(os.path.join(templates_dir, "bootstrap3"))
+            with open(os.path.join(templates_dir, "bootstrap3", "messages.html"), "w") as f:
+                f.write(
+                    "{% for message in messages %}{{ title }}:{{ message }}:{{ message_constants.INFO }}{% endfor %}"
+                )
+            with override_settings(
+                TEMPLATES=[
+                    {
+                        "BACKEND": "django.template.backends.django.DjangoTemplates",
+                        "DIRS": [templates_dir],
+                        "APP_DIRS": True,
+                    }
+                ]
+            ):
+                res = render_template_with_form(
+                    "{% bootstrap_messages %}{{ message_constants }}",
+                    {"messages": [Message(DEFAULT_MESSAGE_LEVELS.INFO, "hi")], "title": "Title"},
+                )
+        self.assertEqual(res, f"Title:hi:{DEFAULT_MESSAGE_LEVELS.INFO}")
+
 
 class UtilsTest(TestCase):
     def test_add_css_class(self):
@@ -441,6 +489,16 @@ class UtilsTest(TestCase):
         classes = add_css_class(css_classes, css_class, prepend=True)
         self.assertEqual(classes, "three four one two")
 
+        classes = add_css_class("one  two", "two one", prepend=True)
+        self.assertEqual(classes, "one two")
+        self.assertIs(classes, add_css_class("one  two", "two one", prepend=True))
+        self.assertEqual(add_css_class(None, "one"), "one")
+
+    def test_remove_css_class(self):
+        self.assertEqual(remove_css_class("one two three", "two"), "one three")
+        self.assertEqual(remove_css_class("one two three", "three one four"), "two")
+        self.assertEqual(remove_css_class(None, "one"), "")
+
     def test_text_value(self):
         self.assertEqual(text_value(""), "")
         self.assertEqual(text_value(" "), " ")
@@ -460,6 +518,43 @@ class UtilsTest(TestCase):
             '<span bar="123">foo</span>',
         )
 
+    def test_render_tag_same_as_format_html(self):
+        def format_html_render_tag(tag, attrs=None, content=None, close=True):
+            builder = "<{tag}{attrs}>{content}"
+            if content or close:
+                builder += "</{tag}>"
+            return format_html(
+                builder, tag=tag, attrs=mark_safe(flatatt(attrs)) if attrs else "", content=text_value(content)
+            )
+
+        rnd = random.Random(3)
+        alphabet = "ab<>&\"' =\u03bc"
+
+        def random_text():
+            return "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 6)))
+
+        def random_value():
+            kind = rnd.randint(0, 7)
+            if kind == 0:
+                return mark_safe(random_text())
+            if kind == 1:
+                return gettext_lazy(random_text())
+            if kind == 2:
+                return rnd.choice([True, False, None])
+            if kind == 3:
+                return rnd.randint(-10, 10)
+            return random_text()
+
+        for _ in range(2000):
+            tag = rnd.choice(["span", "label", "a<b", mark_safe("i")])
+            attrs = {random_text() + "x": random_value() for _ in range(rnd.randint(0, 5))}
+            content = rnd.choice([None, "", 0, random_value()])
+            close = rnd.choice([True, False])
+            expected = format_html_render_tag(tag, attrs, content, close)
+            result = render_tag(tag, attrs, content, close)
+            self.assertEqual(result, expected)
+            self.assertIsInstance(result, SafeString)
+
     def test_url_to_attrs_dict(self):
         self.assertEqual(url_to_attrs_dict("my_link", "src"), {"src": "my_link"})
         self.assertEqual(url_to_attrs_dict({"url": "my_link"}, "src"), {"src": "my_link"})
@@ -591,3 +686,41 @@ class InlineLayoutTestCase(TestCase):
             res,
             msg="Missing relevant whitespace for inline rendering.",
         )
+
+
+class PaginationTest(TestCase):
+    def test_url_param_replacer(self):
+        urls = ["", "/list", "?page=2", "/list?q=a+b&page=3&sort=name", "?a=1&a=2&page=", "http://h/p;x?page=1#top"]
+        for url in urls:
+            for name in ("page", "p g"):
+                replace_param = url_param_replacer(url, name)
+                for value in (1, 25, "é"):
+                    self.assertEqual(replace_param(value), url_replace_param(url, name, value))
+
+    def test_pagination_urls(self):
+        page = Paginator(range(100), 5).page(10)
+        context = get_pagination_context(page, pages_to_show=5, url="/list?page=10&q=x")
+        self.assertEqual(
+            context["page_links"],
+            [(p, f"/list?q=x&page={p}") for p in context["pages_shown"]],
+        )
+        self.assertEqual(context["first_page_url"], "/list?q=x&page=1")
+        self.assertEqual(context["last_page_url"], "/list?q=x&page=20")
+        self.assertEqual(context["pages_back_url"], f"/list?q=x&page={context['pages_back']}")
+        self.assertEqual(context["pages_forward_url"], f"/list?q=x&page={context['pages_forward']}")
+
+    def test_bootstrap_pagination(self):
+        page = Paginator(range(100), 5).page(1)
+        res = render_template_with_form(
+            '{% bootstrap_pagination page pages_to_show=3 url="/list?page=1" %}', {"page": page}
+        )
+        self.assertIn('<li class="prev disabled"><a>&laquo;</a></li>', res)
+        self.assertIn('<a href="/list?page=2">2</a>', res)
+        self.assertIn('<a href="/list?page=20">&raquo;</a>', res)
+        self.assertNotIn("page=0", res)
+
+    def test_pagination_whitespace(self):
+        html = render_to_string("bootstrap3/pagination.html", get_pagination_context(Paginator(range(10), 5).page(1)))
+        # Same whitespace as the template with the {% load %} and {% with %} tags it had before
+        self.assertTrue(html.startswith('\n\n\n    <ul class="pagination">\n\n'))
+        self.assertTrue(html.endswith("    </ul>\n\n\n"))
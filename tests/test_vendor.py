@@ -0,0 +1,95 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from bootstrap3.bootstrap import BOOTSTRAP3_DEFAULTS, css_url, get_bootstrap_setting
+from tests.app.forms import render_template_with_form
+
+
+class VendorCommandTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.static_dir = os.path.join(self.tmp, "static")
+        self.files = {}
+        for name, content in [
+            ("bootstrap.min.css", b".btn{}"),
+            ("bootstrap.min.js", b"// bootstrap"),
+            ("jquery.js", b"//"),
+        ]:
+            path = os.path.join(self.tmp, name)
+            with open(path, "wb") as f:
+                f.write(content)
+            self.files[name] = (path, content)
+
+    def vendor(self, *args):
+        call_command(
+            "bootstrap3_vendor",
+            "--css",
+            self.files["bootstrap.min.css"][0],
+            "--javascript",
+            self.files["bootstrap.min.js"][0],
+            "--jquery",
+            self.files["jquery.js"][0],
+            "--static-dir",
+            self.static_dir,
+            *args,
+            stdout=StringIO(),
+        )
+        return os.path.join(self.static_dir, "bootstrap3", "bootstrap3-manifest.json")
+
+    def test_manifest(self):
+        with open(self.vendor(), encoding="utf-8") as f:
+            assets = json.load(f)["assets"]
+        self.assertEqual(set(assets), {"css_url", "javascript_url", "jquery_url"})
+        content = self.files["bootstrap.min.css"][1]
+        css = assets["css_url"]
+        self.assertEqual(css["path"], f"bootstrap3/bootstrap.{hashlib.sha256(content).hexdigest()[:12]}.min.css")
+        self.assertEqual(css["integrity"], "sha384-" + base64.b64encode(hashlib.sha384(content).digest()).decode())
+        self.assertEqual(css["crossorigin"], "anonymous")
+        with open(os.path.join(self.static_dir, *css["path"].split("/")), "rb") as f:
+            self.assertEqual(f.read(), content)
+
+    def test_settings_use_manifest(self):
+        manifest = self.vendor("--crossorigin", "")
+        with override_settings(BOOTSTRAP3={"asset_manifest": manifest}):
+            url = css_url()
+            self.assertRegex(url["url"], r"^/static/bootstrap3/bootstrap\.[0-9a-f]{12}\.min\.css$")
+            self.assertNotIn("crossorigin", url)
+            # The settings only have the path of the manifest
+            self.assertEqual(get_bootstrap_setting("css_url"), BOOTSTRAP3_DEFAULTS["css_url"])
+            res = render_template_with_form("{% bootstrap_css %}{% bootstrap_javascript jquery=True %}")
+            self.assertIn(f'<link href="{url["url"]}" integrity="{url["integrity"]}" rel="stylesheet">', res)
+            self.assertIn('<script integrity="sha384-', res)
+            self.assertNotIn("//code.jquery.com", res)
+        self.assertIn("//code.jquery.com", render_template_with_form("{% bootstrap_javascript jquery=True %}"))
+
+    def test_nothing_to_vendor(self):
+        with self.assertRaises(CommandError):
+            call_command("bootstrap3_vendor", "--static-dir", self.static_dir, stdout=StringIO())
+
+    @override_settings(BOOTSTRAP3={"asset_manifest": "/does/not/exist.json"})
+    def test_missing_manifest(self):
+        self.assertEqual(get_bootstrap_setting("horizontal_label_class"), "col-md-3")
+        with self.assertWarns(RuntimeWarning):
+            self.assertEqual(css_url(), BOOTSTRAP3_DEFAULTS["css_url"])
+
+    def test_missing_static_files_manifest(self):
+        storages = {"staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"}}
+        manifest = self.vendor()
+        with self.settings(
+            BOOTSTRAP3={"asset_manifest": manifest}, STORAGES=storages, STATIC_ROOT=self.tmp, DEBUG=False
+        ):
+            # Reading the settings does not need the static files, e.g. in collectstatic
+            apps.get_app_config("bootstrap3").ready()
+            with self.assertWarns(RuntimeWarning):
+                res = render_template_with_form("{% bootstrap_css %}")
+        self.assertIn(BOOTSTRAP3_DEFAULTS["css_url"]["url"], res)